@@ -1,6 +1,7 @@
 """Typer-powered CLI for pyteam-skills."""
 
 from __future__ import annotations
+from typing import Optional
 import json
 import os
 
@@ -8,15 +9,31 @@ from rich import print
 from rich.table import Table
 import typer
 
-from .config import Config
-from .dashboard import generate_dashboard
+from .config import Config, load_teams
+from .dashboard import generate_dashboard, generate_team_dashboards
+from .db import load_scan_db, write_scan_db
+from .experts import ExpertIndex
 from .matrix import export_csvs
+from .ownership import blame_ownership
+from .pathtree import bus_factor, find_node, top_authors
+from .repo_scan import rescan as rescan_cache
 from .repo_scan import scan_repo
-
+from .sampling import sample_scan
+from .store import query_store, write_store
 
 app = typer.Typer(add_completion=False, no_args_is_help=True)
 
 
+def _load_scan(scan: Optional[str], db: Optional[str], include_raw: bool = True):
+    """Load scan data from a JSON file or a SQLite scan database."""
+    if db:
+        return load_scan_db(db, include_raw=include_raw)
+    if not scan:
+        raise typer.BadParameter("pass --scan or --db")
+    with open(scan, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
 @app.command()
 def init(
     out: str = typer.Option("config.yml", help="Where to write the default config.")
@@ -29,13 +46,90 @@ def init(
 
 @app.command()
 def scan(
-    repo: str = typer.Option(".", help="Path to Git repository"),
+    repo: str = typer.Option(
+        ".", help="Path to Git repository (checkout, bare or --mirror clone)"
+    ),
     config: str = typer.Option(..., "--config", "-c", help="Config YAML"),
     out: str = typer.Option("scan.json", help="Where to write scan JSON"),
+    mode: str = typer.Option(
+        "history", help="history (weighted commits) or ownership (blame at HEAD)"
+    ),
+    workers: int = typer.Option(0, help="Parallel blame workers (0 = CPU count)"),
+    blame_cache: Optional[str] = typer.Option(
+        None, help="Blob-keyed blame cache JSON (ownership mode)"
+    ),
+    store: Optional[str] = typer.Option(
+        None, help="Also merge commits into this date-indexed store directory"
+    ),
+    db: Optional[str] = typer.Option(
+        None, help="Also append the scan to this SQLite database"
+    ),
+    sample: Optional[float] = typer.Option(
+        None, help="Approximate from this fraction of commits, e.g. 0.05"
+    ),
+    seed: int = typer.Option(0, help="Random seed for --sample"),
+    raw_cache: Optional[str] = typer.Option(
+        None, help="Also cache raw per-file commit stats here (for rescan)"
+    ),
 ) -> None:
     """Scan a Git repository and write a JSON artifact."""
+    if mode not in ("history", "ownership"):
+        raise typer.BadParameter("mode must be 'history' or 'ownership'")
+    if sample:
+        for flag, value in (
+            ("--raw-cache", raw_cache),
+            ("--store", store),
+            ("--db", db),
+        ):
+            if value:
+                raise typer.BadParameter(f"{flag} needs a full scan, not --sample")
+    if mode == "ownership":
+        for flag, value in (
+            ("--sample", sample),
+            ("--raw-cache", raw_cache),
+            ("--store", store),
+        ):
+            if value:
+                raise typer.BadParameter(f"{flag} only applies to --mode history")
+    else:
+        for flag, value in (("--workers", workers), ("--blame-cache", blame_cache)):
+            if value:
+                raise typer.BadParameter(f"{flag} only applies to --mode ownership")
+    cfg = Config.from_file(config)
+    if mode == "history" and sample:
+        data = sample_scan(repo, cfg, rate=sample, seed=seed)
+        info = data["sample"]
+        print(
+            f"Sampled {info['commits_sampled']} of {info['commits_total']} commits "
+            f"({info['fraction']:.1%}) across {info['strata']} strata"
+        )
+    elif mode == "history":
+        data = scan_repo(repo, cfg, raw_cache=raw_cache)
+    else:
+        data = blame_ownership(
+            repo, cfg, workers=workers or None, cache_path=blame_cache
+        )
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    print(f"[green]Wrote scan to[/green] {out}")
+    if store:
+        added = write_store(data, store)
+        print(f"[green]Stored {added} new commits in[/green] {store}")
+    if db:
+        write_scan_db(data, db)
+        print(f"[green]Wrote scan database[/green] {db}")
+
+
+@app.command()
+def rescan(
+    cache: str = typer.Option(..., help="Raw stats cache from scan --raw-cache"),
+    config: str = typer.Option(..., "--config", "-c", help="Config YAML"),
+    out: str = typer.Option("scan.json", help="Where to write scan JSON"),
+) -> None:
+    """Rebuild a scan JSON from cached raw stats with a new config, without git."""
     cfg = Config.from_file(config)
-    data = scan_repo(repo, cfg)
+    data = rescan_cache(cache, cfg)
     os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
     with open(out, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=2)
@@ -44,31 +138,174 @@ def scan(
 
 @app.command()
 def matrix(
-    scan: str = typer.Option(..., help="scan.json from the scan step"),
+    scan: Optional[str] = typer.Option(None, help="scan.json from the scan step"),
+    db: Optional[str] = typer.Option(None, help="SQLite database from scan --db"),
     out: str = typer.Option("artifacts", help="Output directory"),
+    compress: Optional[str] = typer.Option(None, help="Compress output: gzip or zstd"),
+    fmt: str = typer.Option("csv", "--format", help="Output format: csv or parquet"),
+    sparse: bool = typer.Option(
+        False, help="Keep the matrix sparse; write only the long-format matrix"
+    ),
+    granularity: str = typer.Option(
+        "month", help="Trend buckets: day, week, month, quarter or year"
+    ),
 ) -> None:
-    """Export CSV artifacts from a previous scan JSON."""
-    with open(scan, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    """Export CSV artifacts from a previous scan JSON or database."""
+    data = _load_scan(scan, db)
+    paths = export_csvs(
+        data, out, compress=compress, fmt=fmt, sparse=sparse, granularity=granularity
+    )
+    tbl = Table("Artifact", "Path")
+    for k, v in paths.items():
+        tbl.add_row(k, v)
+    print(tbl)
+
+
+@app.command()
+def query(
+    store: Optional[str] = typer.Option(
+        None, help="Store directory written by scan --store"
+    ),
+    db: Optional[str] = typer.Option(None, help="SQLite database from scan --db"),
+    config: Optional[str] = typer.Option(
+        None, "--config", "-c", help="Config YAML (weights and decay)"
+    ),
+    since: Optional[str] = typer.Option(None, help="Window start (ISO, inclusive)"),
+    until: Optional[str] = typer.Option(None, help="Window end (ISO, exclusive)"),
+    out: str = typer.Option("artifacts", help="Output directory"),
+) -> None:
+    """Export CSVs and a scan JSON for a time window from a store or database.
+
+    With --store, scores are recomputed with the config's weights and decay;
+    with --db, the stored scores are summed in SQL.
+    """
+    if store:
+        cfg = Config.from_file(config) if config else Config()
+        data = query_store(store, cfg, since=since, until=until)
+    elif db:
+        data = load_scan_db(db, since=since, until=until)
+    else:
+        raise typer.BadParameter("pass --store or --db")
+    os.makedirs(out, exist_ok=True)
     paths = export_csvs(data, out)
+    scan_path = os.path.join(out, "scan.json")
+    with open(scan_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    paths["scan"] = scan_path
     tbl = Table("Artifact", "Path")
     for k, v in paths.items():
         tbl.add_row(k, v)
     print(tbl)
 
 
+@app.command()
+def experts(
+    scan: Optional[str] = typer.Option(None, help="scan.json to index"),
+    index: Optional[str] = typer.Option(
+        None, help="Prebuilt index JSON (written with --save-index)"
+    ),
+    skill: Optional[str] = typer.Option(None, help="Top authors for this skill"),
+    author: Optional[str] = typer.Option(None, help="Top skills for this author"),
+    path: Optional[str] = typer.Option(None, help="Top authors under this path"),
+    since: Optional[str] = typer.Option(
+        None, help="First month (YYYY-MM or ISO date), --skill"
+    ),
+    until: Optional[str] = typer.Option(
+        None, help="Last month (YYYY-MM or ISO date), --skill"
+    ),
+    k: int = typer.Option(5, "--k", "-k", help="Number of results"),
+    save_index: Optional[str] = typer.Option(None, help="Write the index here"),
+) -> None:
+    """Answer top-K "who knows X" queries from a scan or a saved index."""
+    if index:
+        idx = ExpertIndex.from_file(index)
+    elif scan:
+        with open(scan, "r", encoding="utf-8") as f:
+            idx = ExpertIndex.from_scan(json.load(f))
+    else:
+        raise typer.BadParameter("pass --scan or --index")
+    if save_index:
+        idx.save(save_index)
+        print(f"[green]Wrote expert index to[/green] {save_index}")
+
+    if skill:
+        try:
+            rows = idx.top_for_skill(skill, k, since, until)
+        except ValueError as e:
+            raise typer.BadParameter(str(e))
+        title = "Author"
+    elif author:
+        title, rows = "Skill", idx.top_for_author(author, k)
+    elif path is not None:
+        title, rows = "Author", idx.top_for_path(path, k)
+    else:
+        return
+    tbl = Table("#", title, "Score")
+    for rank, (name, score) in enumerate(rows, 1):
+        tbl.add_row(str(rank), name, f"{score:.2f}")
+    print(tbl)
+
+
+@app.command()
+def owners(
+    path: str = typer.Option(..., help="Directory or file, e.g. services/billing/"),
+    scan: Optional[str] = typer.Option(None, help="scan.json from the scan step"),
+    db: Optional[str] = typer.Option(None, help="SQLite database from scan --db"),
+    k: int = typer.Option(5, "--k", "-k", help="Number of authors"),
+) -> None:
+    """Show top authors and bus factor for a directory subtree."""
+    data = _load_scan(scan, db, include_raw=False)
+    if "path_tree" not in data:
+        raise typer.BadParameter("scan has no path_tree; rescan with this version")
+    node = find_node(data["path_tree"], path)
+    if node is None:
+        print(f"[red]No contributions under[/red] {path}")
+        raise typer.Exit(1)
+    tbl = Table("#", "Author", "Score", "Share")
+    total = sum(node["scores"].values()) or 1.0
+    for rank, (name, score) in enumerate(top_authors(node["scores"], k), 1):
+        tbl.add_row(str(rank), name, f"{score:.2f}", f"{100 * score / total:.1f}%")
+    print(tbl)
+    print(f"Bus factor: {bus_factor(node['scores'])}")
+
+
 @app.command()
 def dashboard(
-    scan: str = typer.Option(..., help="scan.json from the scan step"),
+    scan: Optional[str] = typer.Option(None, help="scan.json from the scan step"),
+    db: Optional[str] = typer.Option(None, help="SQLite database from scan --db"),
     out: str = typer.Option(
         "artifacts/dashboard", help="Output directory for static dashboard"
     ),
+    sparse: bool = typer.Option(False, help="Embed matrices in sparse COO form"),
+    granularity: str = typer.Option(
+        "month", help="Trend buckets: day, week, month, quarter or year"
+    ),
+    split_by: Optional[str] = typer.Option(
+        None, help="'team' writes one dashboard per team plus an org index"
+    ),
+    teams: Optional[str] = typer.Option(
+        None, help="YAML mapping team -> author substrings (with --split-by team)"
+    ),
+    workers: int = typer.Option(0, help="Parallel team writers (0 = CPU count)"),
 ) -> None:
-    """Build the static dashboard HTML and data.json from a scan JSON."""
+    """Build the static dashboard HTML and data.json from a scan JSON or database."""
 
-    with open(scan, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    paths = generate_dashboard(data, out)
+    if split_by not in (None, "team"):
+        raise typer.BadParameter("--split-by only supports 'team'")
+    if split_by and not teams:
+        raise typer.BadParameter("--split-by team needs --teams")
+    data = _load_scan(scan, db, include_raw=False)
+    if split_by:
+        paths = generate_team_dashboards(
+            data,
+            out,
+            load_teams(teams),
+            sparse=sparse,
+            granularity=granularity,
+            workers=workers or None,
+        )
+    else:
+        paths = generate_dashboard(data, out, sparse=sparse, granularity=granularity)
     tbl = Table("Artifact", "Path")
     for k, v in paths.items():
         tbl.add_row(k, v)
@@ -15,6 +15,7 @@ class Config:
     extension_skills: Dict[str, List[str]] = field(default_factory=dict)
     path_skills: Dict[str, List[str]] = field(default_factory=dict)
     regex_skills: Dict[str, List[str]] = field(default_factory=dict)
+    content_skills: Dict[str, List[str]] = field(default_factory=dict)
     weights: Dict[str, float] = field(
         default_factory=lambda: {
             "lines_changed": 1.0,
@@ -36,3 +37,15 @@ class Config:
     def save(self, path: str) -> None:
         with open(path, "w", encoding="utf-8") as f:
             yaml.safe_dump(self.__dict__, f, sort_keys=False)
+
+
+def load_teams(path: str) -> Dict[str, List[str]]:
+    """Load a ``team: [author substrings]`` YAML mapping (a single string is ok)."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = yaml.safe_load(f) or {}
+    if not isinstance(data, dict):
+        raise ValueError(f"Teams file '{path}' must map team names to authors.")
+    return {
+        str(team): [members] if isinstance(members, str) else list(members or [])
+        for team, members in data.items()
+    }
@@ -0,0 +1,117 @@
+"""Content-based skill rules evaluated on file blobs.
+
+Blobs are read through long-lived ``git cat-file --batch-check`` / ``--batch``
+processes (one round-trip per object instead of one subprocess per file),
+and rule results are cached by blob SHA so every unique blob is inspected
+once per run.
+"""
+
+from __future__ import annotations
+from typing import Dict, List, Optional, Tuple
+import re
+import subprocess
+
+# Only the head of a blob is searched; imports/signatures live there.
+MAX_BYTES = 256 * 1024
+CHUNK = 64 * 1024
+
+
+class _CatFile:
+    """A persistent ``git cat-file`` process in ``--batch`` or ``--batch-check`` mode."""
+
+    def __init__(self, root: str, mode: str):
+        self.proc = subprocess.Popen(
+            ["git", "-C", root, "cat-file", mode],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+
+    def header(self, spec: str) -> Optional[Tuple[str, str, int]]:
+        """Send *spec* and return ``(sha, type, size)``, or None if missing."""
+        assert self.proc.stdin and self.proc.stdout
+        try:
+            self.proc.stdin.write(spec.encode("utf-8") + b"\n")
+            self.proc.stdin.flush()
+        except BrokenPipeError:
+            raise RuntimeError(
+                f"git cat-file exited with status {self.proc.wait()}."
+            ) from None
+        parts = self.proc.stdout.readline().decode("utf-8").split()
+        if len(parts) != 3:
+            return None
+        return parts[0], parts[1], int(parts[2])
+
+    def read(self, size: int, limit: int) -> bytes:
+        """Read an object body of *size* bytes and its trailing newline.
+
+        Only the first *limit* bytes are kept; the rest is drained in chunks.
+        """
+        assert self.proc.stdout
+        data = self.proc.stdout.read(min(size, limit))
+        left = size - len(data)
+        while left > 0:
+            left -= len(self.proc.stdout.read(min(left, CHUNK)))
+        self.proc.stdout.read(1)
+        return data
+
+    def close(self) -> None:
+        if self.proc.stdin:
+            try:
+                self.proc.stdin.close()
+            except BrokenPipeError:
+                pass  # the process is already gone
+        self.proc.wait()
+
+
+class BlobIndex:
+    """Resolve ``rev:path`` to blob SHAs through one ``--batch-check`` process."""
+
+    def __init__(self, root: str):
+        self._check = _CatFile(root, "--batch-check")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._check.close()
+
+    def blob_sha(self, rev: str, path: str) -> Optional[str]:
+        """Resolve ``rev:path`` to a blob SHA without reading its content."""
+        head = self._check.header(f"{rev}:{path}")
+        if head is None or head[1] != "blob":
+            return None
+        return head[0]
+
+
+class ContentClassifier(BlobIndex):
+    """Match ``content_skills`` regexes against blob text, cached by blob SHA."""
+
+    def __init__(self, root: str, rules: Dict[str, List[str]]):
+        super().__init__(root)
+        self.rules = [(re.compile(p, re.MULTILINE), s) for p, s in rules.items()]
+        self._batch = _CatFile(root, "--batch")
+        self._cache: Dict[str, Optional[List[str]]] = {}
+
+    def close(self) -> None:
+        super().close()
+        self._batch.close()
+
+    def skills(self, sha: str) -> Optional[List[str]]:
+        """Skills of the first rule matching blob *sha*, or None."""
+        if sha in self._cache:
+            return self._cache[sha]
+        result: Optional[List[str]] = None
+        head = self._batch.header(sha)
+        if head is not None:
+            data = self._batch.read(head[2], MAX_BYTES)
+            if b"\0" not in data[:8000]:  # skip binaries
+                text = data.decode("utf-8", errors="ignore")
+                for pattern, skills in self.rules:
+                    if pattern.search(text):
+                        result = skills
+                        break
+        self._cache[sha] = result
+        return result
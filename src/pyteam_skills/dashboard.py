@@ -1,12 +1,19 @@
 """Static dashboard generator (single-file HTML with embedded JSON)."""
 
 from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from html import escape
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 import json
 import os
+import re
 
-from .matrix import build_skill_matrix, _normalize_matrix, build_trends
+import numpy as np
+
+from .matrix import build_skill_matrix, _normalize_matrix, build_trends, to_long
+from .pathtree import bus_factor, export_directories, top_authors
+from .utils import matches_any
 
 
 def _to_serializable(df):
@@ -18,6 +25,27 @@ def _to_serializable(df):
     }
 
 
+def _to_sparse_serializable(mat, norm):
+    """Encode raw and normalized matrices as COO (non-zero cells only)."""
+    long = to_long(mat, norm)
+    row_of = {a: i for i, a in enumerate(mat.index)}
+    col_of = {s: j for j, s in enumerate(mat.columns)}
+    rows = [row_of[a] for a in long["author"]]
+    cols = [col_of[s] for s in long["skill"]]
+
+    def coo(values):
+        return {
+            "format": "coo",
+            "index": list(mat.index),
+            "columns": list(mat.columns),
+            "row": rows,
+            "col": cols,
+            "values": [float(x) for x in values],
+        }
+
+    return coo(long["score"]), coo(long["norm"])
+
+
 def _make_html() -> str:
     """Return the static dashboard HTML (triple-quoted to avoid syntax issues)."""
     return """<!doctype html>
@@ -58,7 +86,7 @@ def _make_html() -> str:
     <div class="max-w-7xl mx-auto px-4 py-3 flex items-center justify-between">
       <div class="flex items-center gap-3">
         <div class="h-8 w-8 rounded-xl bg-gradient-to-br from-indigo-500 to-violet-600"></div>
-        <h1 class="text-lg font-semibold">Skills Dashboard</h1>
+        <h1 id="dashTitle" class="text-lg font-semibold">Skills Dashboard</h1>
       </div>
       <div class="flex items-center gap-3">
         <button id="darkToggle" class="btn btn-soft">🌙 Theme</button>
@@ -86,7 +114,7 @@ def _make_html() -> str:
           </div>
         </div>
         <div class="flex-1">
-          <label class="block text-sm text-slate-600 dark:text-slate-300 mb-1">Month</label>
+          <label id="periodLabel" class="block text-sm text-slate-600 dark:text-slate-300 mb-1">Month</label>
           <div class="select-wrap">
             <select id="monthSelect" class="select select-sm"><option value="">All Months</option></select>
             <svg class="select-chevron" width="18" height="18" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><path d="M6 9l6 6 6-6"/></svg>
@@ -151,13 +179,13 @@ def _make_html() -> str:
     <!-- Trends -->
     <section class="rounded-2xl p-6 bg-white dark:bg-slate-900 shadow-xl-soft border border-slate-100 dark:border-slate-800">
       <div class="flex items-center justify-between mb-4">
-        <h2 class="text-lg font-semibold">Monthly Trends <span class="text-slate-500">(normalized 1–100)</span></h2>
-        <div class="text-xs text-slate-500">Per (month, skill), top author = 100</div>
+        <h2 class="text-lg font-semibold"><span id="trendTitle">Monthly</span> Trends <span class="text-slate-500">(normalized 1–100)</span></h2>
+        <div class="text-xs text-slate-500">Per (<span id="trendPeriod">month</span>, skill), top author = 100</div>
       </div>
       <div class="overflow-auto rounded-xl border border-slate-200 dark:border-slate-800">
         <table class="w-full text-sm" id="trendTable">
           <thead class="bg-slate-50 dark:bg-slate-800">
-            <tr><th class="px-4 py-3 text-left">Month</th><th class="px-4 py-3 text-left">Skill</th><th class="px-4 py-3 text-left">Author</th><th class="px-4 py-3 text-left">Score</th></tr>
+            <tr><th id="periodHeader" class="px-4 py-3 text-left">Month</th><th class="px-4 py-3 text-left">Skill</th><th class="px-4 py-3 text-left">Author</th><th class="px-4 py-3 text-left">Score</th></tr>
           </thead>
           <tbody class="divide-y divide-slate-100 dark:divide-slate-800"></tbody>
         </table>
@@ -180,6 +208,22 @@ def _make_html() -> str:
         </div>
       </div>
     </section>
+
+    <!-- Directory ownership -->
+    <section id="dirSection" class="hidden rounded-2xl p-6 bg-white dark:bg-slate-900 shadow-xl-soft border border-slate-100 dark:border-slate-800">
+      <div class="flex items-center justify-between mb-4">
+        <h2 class="text-lg font-semibold">Directory Ownership</h2>
+        <div class="text-xs text-slate-500">Bus factor = fewest authors holding half the score</div>
+      </div>
+      <div class="overflow-auto rounded-xl border border-slate-200 dark:border-slate-800">
+        <table class="w-full text-sm" id="dirTable">
+          <thead class="bg-slate-50 dark:bg-slate-800">
+            <tr><th class="px-4 py-3 text-left">Directory</th><th class="px-4 py-3 text-left">Top Authors</th><th class="px-4 py-3 text-left">Authors</th><th class="px-4 py-3 text-left">Bus Factor</th></tr>
+          </thead>
+          <tbody class="divide-y divide-slate-100 dark:divide-slate-800"></tbody>
+        </table>
+      </div>
+    </section>
   </main>
 
   <!-- Keep this placeholder BEFORE the main script so it's available when parsed.
@@ -190,6 +234,34 @@ def _make_html() -> str:
     // Load embedded data (first placeholder already has data after generation)
     const DATA = JSON.parse(document.getElementById('data-script').textContent);
 
+    // Sparse (COO) matrices are expanded once for rendering
+    function densify(m){
+      if(!m || m.format!=='coo') return m;
+      const data=m.index.map(()=>new Array(m.columns.length).fill(0));
+      for(let k=0;k<m.values.length;k++) data[m.row[k]][m.col[k]]=m.values[k];
+      return { index:m.index, columns:m.columns, data };
+    }
+    DATA.matrix_raw = densify(DATA.matrix_raw);
+    DATA.matrix_norm = densify(DATA.matrix_norm);
+
+    // Team dashboards (dashboard --split-by team) carry their team name
+    if (DATA.meta && DATA.meta.team) {
+      document.getElementById('dashTitle').textContent = `Skills Dashboard · ${DATA.meta.team}`;
+      document.title = `Skills · ${DATA.meta.team}`;
+    }
+
+    // Trend bucket key: month (default), week, quarter or year
+    const PERIOD = (DATA.meta && DATA.meta.granularity) || 'month';
+    const PERIOD_LABEL = PERIOD.charAt(0).toUpperCase() + PERIOD.slice(1);
+    (DATA.trends||[]).forEach(r=>{ r.month = r[PERIOD]; });
+    if (PERIOD !== 'month') {
+      document.getElementById('periodLabel').textContent = PERIOD_LABEL;
+      document.getElementById('periodHeader').textContent = PERIOD_LABEL;
+      document.getElementById('trendPeriod').textContent = PERIOD;
+      document.getElementById('trendTitle').textContent = PERIOD === 'day' ? 'Daily' : PERIOD_LABEL + 'ly';
+      document.querySelector('#monthSelect option').textContent = `All ${PERIOD_LABEL}s`;
+    }
+
     // Pagination state & helpers
     const matrixState = { page: 0, size: 20 };
     const trendState  = { page: 0, size: 25 };
@@ -235,7 +307,7 @@ def _make_html() -> str:
     function renderChips(){ activeChips.innerHTML=''; const chips=[];
       if(authorSelect.value) chips.push({label:`Author: ${authorSelect.value}`,clear:()=>authorSelect.value=''});
       if(skillSelect.value) chips.push({label:`Skill: ${skillSelect.value}`,clear:()=>skillSelect.value=''});
-      if(monthSelect.value) chips.push({label:`Month: ${monthSelect.value}`,clear:()=>monthSelect.value=''});
+      if(monthSelect.value) chips.push({label:`${PERIOD_LABEL}: ${monthSelect.value}`,clear:()=>monthSelect.value=''});
       if(searchInput.value) chips.push({label:`Search: ${searchInput.value}`,clear:()=>searchInput.value=''});
       chips.forEach(c=>{ const s=document.createElement('span'); s.className='chip'; s.innerHTML=`${c.label} <button class="ml-2">✕</button>`; s.querySelector('button').addEventListener('click',()=>{c.clear(); rerender();}); activeChips.appendChild(s); });
     }
@@ -334,6 +406,26 @@ def _make_html() -> str:
       if(next) next.disabled = page >= totalPages-1;
     }
 
+    // DIRECTORIES (top 100 matches by score)
+    const dirTable=document.getElementById('dirTable');
+    function renderDirectories(){
+      const dirs=DATA.directories||[];
+      if(!dirs.length) return;
+      document.getElementById('dirSection').classList.remove('hidden');
+      const authorFilter=authorSelect.value, q=searchInput.value.toLowerCase();
+      const rows=dirs
+        .filter(d=>!authorFilter||d.top_authors.some(([a])=>a===authorFilter))
+        .filter(d=>!q||d.path.toLowerCase().includes(q)||d.top_authors.some(([a])=>a.toLowerCase().includes(q)))
+        .sort((a,b)=>b.score-a.score).slice(0,100);
+      const tbody=dirTable.querySelector('tbody'); tbody.innerHTML='';
+      rows.forEach(d=>{
+        const tr=document.createElement('tr'); tr.className='hover:bg-slate-50/60 dark:hover:bg-slate-800/50';
+        const top=d.top_authors.map(([a,v])=>`${a} <span class="text-slate-500">(${Math.round(v)})</span>`).join('<br>');
+        tr.innerHTML=`<td class="px-4 py-3 font-medium whitespace-nowrap">${d.path}</td><td class="px-4 py-3">${top}</td><td class="px-4 py-3">${d.authors}</td><td class="px-4 py-3">${d.bus_factor}</td>`;
+        tbody.appendChild(tr);
+      });
+    }
+
     // Controls wiring
     const matrixPrev = document.getElementById('matrixPrev');
     const matrixNext = document.getElementById('matrixNext');
@@ -352,7 +444,7 @@ def _make_html() -> str:
     // Reset pages when filters/search change
     function rerender(){
       matrixState.page = 0; trendState.page = 0;
-      renderChips(); computeKPIs(); renderMatrix(); renderTrends();
+      renderChips(); computeKPIs(); renderMatrix(); renderTrends(); renderDirectories();
     }
     authorSelect.addEventListener('change', rerender);
     skillSelect.addEventListener('change', rerender);
@@ -371,18 +463,26 @@ def _make_html() -> str:
 </html>"""
 
 
-def generate_dashboard(scan: Dict[str, Any], out_dir: str) -> Dict[str, str]:
-    """Generate the dashboard artifacts and return their paths."""
-    os.makedirs(out_dir, exist_ok=True)
-    mat_raw = build_skill_matrix(scan)
-    mat_norm = _normalize_matrix(mat_raw)
-    trends = build_trends(scan)
-    data = {
-        "matrix_raw": _to_serializable(mat_raw),
-        "matrix_norm": _to_serializable(mat_norm),
+def _dashboard_data(
+    mat_raw, mat_norm, trends, directories, meta: Dict[str, Any], sparse: bool
+) -> Dict[str, Any]:
+    """Assemble the JSON payload embedded in a dashboard page."""
+    if sparse:
+        raw_json, norm_json = _to_sparse_serializable(mat_raw, mat_norm)
+    else:
+        raw_json, norm_json = _to_serializable(mat_raw), _to_serializable(mat_norm)
+    return {
+        "matrix_raw": raw_json,
+        "matrix_norm": norm_json,
         "trends": trends.to_dict(orient="records"),
-        "meta": {"repo": scan.get("repo"), "scanned_at": scan.get("scanned_at")},
+        "directories": directories,
+        "meta": meta,
     }
+
+
+def _write_dashboard(data: Dict[str, Any], out_dir: str) -> Dict[str, str]:
+    """Write data.json and the single-file index.html for one dashboard."""
+    os.makedirs(out_dir, exist_ok=True)
     data_path = Path(out_dir) / "data.json"
     with open(data_path, "w", encoding="utf-8") as f:
         json.dump(data, f)
@@ -405,3 +505,220 @@ def generate_dashboard(scan: Dict[str, Any], out_dir: str) -> Dict[str, str]:
         f.write(content)
 
     return {"index_html": str(html_path), "data_json": str(data_path)}
+
+
+def generate_dashboard(
+    scan: Dict[str, Any],
+    out_dir: str,
+    sparse: bool = False,
+    granularity: str = "month",
+) -> Dict[str, str]:
+    """Generate the dashboard artifacts and return their paths.
+
+    With ``sparse=True`` the matrices are embedded in COO form, so the data
+    size scales with non-zero author×skill cells.
+    """
+    mat_raw = build_skill_matrix(scan, sparse=sparse)
+    mat_norm = _normalize_matrix(mat_raw)
+    trends = build_trends(scan, granularity)
+    directories = export_directories(scan["path_tree"]) if "path_tree" in scan else []
+    meta = {
+        "repo": scan.get("repo"),
+        "scanned_at": scan.get("scanned_at"),
+        "granularity": granularity,
+    }
+    data = _dashboard_data(mat_raw, mat_norm, trends, directories, meta, sparse)
+    return _write_dashboard(data, out_dir)
+
+
+def assign_teams(
+    authors: List[str], teams: Dict[str, List[str]]
+) -> Dict[str, List[str]]:
+    """Map each team to its authors; an author joins the first team that matches.
+
+    Team entries are author substrings (case-insensitive), like ``ignore_authors``.
+    """
+    members: Dict[str, List[str]] = {team: [] for team in teams}
+    for author in authors:
+        for team, patterns in teams.items():
+            if matches_any(author, patterns):
+                members[team].append(author)
+                break
+    return members
+
+
+def _slug(name: str, used: set) -> str:
+    """Directory-safe, unique slug for a team name."""
+    base = re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-") or "team"
+    slug, n = base, 2
+    while slug in used:
+        slug, n = f"{base}-{n}", n + 1
+    used.add(slug)
+    return slug
+
+
+def _make_index_html(rows: List[Dict[str, Any]], meta: Dict[str, Any]) -> str:
+    """Org-level page linking every team dashboard."""
+    body = "\n".join(
+        f'<tr class="border-t border-slate-200"><td class="px-3 py-2">'
+        f'<a class="text-indigo-600 hover:underline" href="{escape(r["href"])}">'
+        f'{escape(r["team"])}</a></td><td class="px-3 py-2 text-right">{r["authors"]}</td>'
+        f'<td class="px-3 py-2">{escape(", ".join(r["top_skills"]))}</td></tr>'
+        for r in rows
+    )
+    unassigned = meta.get("unassigned", 0)
+    return f"""<!doctype html>
+<html lang="en">
+<head>
+  <meta charset="utf-8" />
+  <meta name="viewport" content="width=device-width, initial-scale=1" />
+  <title>Team Skills Dashboards</title>
+  <script src="https://cdn.tailwindcss.com"></script>
+</head>
+<body class="bg-slate-50 text-slate-900">
+  <main class="max-w-4xl mx-auto px-4 py-8 space-y-4">
+    <h1 class="text-lg font-semibold">Team Skills Dashboards</h1>
+    <p class="text-sm text-slate-500">{escape(str(meta.get("repo") or ""))} · scanned {escape(str(meta.get("scanned_at") or ""))} · {unassigned} author(s) without a team</p>
+    <table class="w-full text-sm bg-white rounded-xl">
+      <thead class="bg-slate-100"><tr><th class="px-3 py-2 text-left">Team</th><th class="px-3 py-2 text-right">Authors</th><th class="px-3 py-2 text-left">Top skills</th></tr></thead>
+      <tbody>
+{body}
+      </tbody>
+    </table>
+  </main>
+</body>
+</html>"""
+
+
+# Frames shared by every team, set once per worker process by _init_team_worker
+_SHARED: Dict[str, Any] = {}
+
+
+def _init_team_worker(shared: Dict[str, Any]) -> None:
+    _SHARED.update(shared)
+
+
+def _team_directories(
+    directories: List[Dict[str, Any]], members: set, k: int = 3
+) -> List[Dict[str, Any]]:
+    """Directory rows re-ranked by team members only (score, owners, bus factor)."""
+    rows: List[Dict[str, Any]] = []
+    for d in directories:
+        scores = {a: v for a, v in d["top_authors"] if a in members}
+        if not scores:
+            continue
+        rows.append(
+            {
+                **d,
+                "score": sum(scores.values()),
+                "authors": len(scores),
+                "bus_factor": bus_factor(scores),
+                "top_authors": top_authors(scores, k),
+            }
+        )
+    return rows
+
+
+def _write_team_dashboard(
+    team: str, authors: List[str], team_dir: str
+) -> Dict[str, Any]:
+    """Slice the shared frames for one team and write its dashboard (in a worker)."""
+    mat_raw, mat_norm, trends = _SHARED["raw"], _SHARED["norm"], _SHARED["trends"]
+    pos = mat_raw.index.get_indexer(authors)
+    team_raw = mat_raw.iloc[pos]
+    skills = [c for c in team_raw.columns if (team_raw[c] != 0).any()]
+    team_raw = team_raw[skills]
+    team_norm = mat_norm.iloc[pos][skills]
+    picked = [_SHARED["trend_rows"][a] for a in authors if a in _SHARED["trend_rows"]]
+    team_trends = (
+        trends.iloc[np.sort(np.concatenate(picked))] if picked else trends.iloc[:0]
+    )
+    team_dirs = _team_directories(_SHARED["directories"], set(authors))
+    data = _dashboard_data(
+        team_raw,
+        team_norm,
+        team_trends,
+        team_dirs,
+        {**_SHARED["meta"], "team": team},
+        _SHARED["sparse"],
+    )
+    paths = _write_dashboard(data, team_dir)
+    totals = team_norm.sum(axis=0).sort_values(ascending=False)
+    return {**paths, "top_skills": [str(x) for x in totals.index[:3]]}
+
+
+def generate_team_dashboards(
+    scan: Dict[str, Any],
+    out_dir: str,
+    teams: Dict[str, List[str]],
+    sparse: bool = False,
+    granularity: str = "month",
+    workers: Optional[int] = None,
+) -> Dict[str, str]:
+    """Write one dashboard per team plus an org index page; return their paths.
+
+    The matrices, trends and directory table are computed once for the whole
+    scan, so scores stay normalized against the org. Each worker process
+    receives those frames once, then slices, encodes and writes whole team
+    dashboards by row lookups. Directory tables are re-ranked by team members.
+    """
+    mat_raw = build_skill_matrix(scan, sparse=sparse)
+    shared = {
+        "raw": mat_raw,
+        "norm": _normalize_matrix(mat_raw),
+        "sparse": sparse,
+        "meta": {
+            "repo": scan.get("repo"),
+            "scanned_at": scan.get("scanned_at"),
+            "granularity": granularity,
+        },
+    }
+    trends = build_trends(scan, granularity)
+    shared["trends"] = trends
+    shared["trend_rows"] = trends.groupby("author").indices if not trends.empty else {}
+    # every author's score per directory, so teams can re-rank their own
+    shared["directories"] = (
+        export_directories(scan["path_tree"], k=len(scan["path_tree"]["scores"]))
+        if "path_tree" in scan
+        else []
+    )
+
+    members = assign_teams(list(mat_raw.index), teams)
+    used: set = set()
+    jobs = {
+        team: (authors, str(Path(out_dir) / _slug(team, used)))
+        for team, authors in members.items()
+        if authors
+    }
+
+    paths: Dict[str, str] = {}
+    rows: List[Dict[str, Any]] = []
+    if jobs:
+        with ProcessPoolExecutor(
+            max_workers=workers or None,
+            initializer=_init_team_worker,
+            initargs=(shared,),
+        ) as pool:
+            futures = {
+                team: pool.submit(_write_team_dashboard, team, authors, team_dir)
+                for team, (authors, team_dir) in jobs.items()
+            }
+            for team, fut in futures.items():
+                written = fut.result()
+                paths[team] = written["index_html"]
+                rows.append(
+                    {
+                        "team": team,
+                        "href": f"{Path(jobs[team][1]).name}/index.html",
+                        "authors": len(jobs[team][0]),
+                        "top_skills": written["top_skills"],
+                    }
+                )
+
+    meta = dict(shared["meta"])
+    meta["unassigned"] = len(mat_raw.index) - sum(len(a) for a in members.values())
+    os.makedirs(out_dir, exist_ok=True)
+    index_path = Path(out_dir) / "index.html"
+    with open(index_path, "w", encoding="utf-8") as f:
+        f.write(_make_index_html(rows, meta))
+    return {"index_html": str(index_path), **paths}
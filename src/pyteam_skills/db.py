@@ -0,0 +1,288 @@
+"""Optional SQLite backend for scans with indexed, SQL-aggregated reads.
+
+The database runs in WAL mode and is written in batched transactions, so
+readers (``matrix``, ``dashboard``, ``query``) can work while a scan appends.
+"""
+
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Tuple
+import datetime as dt
+import sqlite3
+
+from .pathtree import new_node, tree_add
+from .utils import month_bucket
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS commits (
+    hash TEXT PRIMARY KEY,
+    author TEXT NOT NULL,
+    date TEXT NOT NULL,
+    ts REAL NOT NULL,
+    total_lines_changed INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS file_contributions (
+    commit_hash TEXT NOT NULL,
+    path TEXT NOT NULL,
+    lines_added INTEGER NOT NULL,
+    lines_deleted INTEGER NOT NULL,
+    change_type TEXT,
+    UNIQUE (commit_hash, path)
+);
+CREATE TABLE IF NOT EXISTS contributions (
+    commit_hash TEXT NOT NULL,
+    author TEXT NOT NULL,
+    date TEXT NOT NULL,
+    ts REAL NOT NULL,
+    month TEXT NOT NULL,
+    path TEXT NOT NULL,
+    skill TEXT NOT NULL,
+    lines_added INTEGER NOT NULL,
+    lines_deleted INTEGER NOT NULL,
+    score REAL NOT NULL,
+    UNIQUE (commit_hash, path, skill, author)
+);
+CREATE TABLE IF NOT EXISTS skill_scores (
+    author TEXT NOT NULL,
+    skill TEXT NOT NULL,
+    score REAL NOT NULL,
+    PRIMARY KEY (author, skill)
+);
+CREATE INDEX IF NOT EXISTS ix_commits_ts ON commits (ts);
+CREATE INDEX IF NOT EXISTS ix_contrib_author ON contributions (author);
+CREATE INDEX IF NOT EXISTS ix_contrib_skill ON contributions (skill);
+CREATE INDEX IF NOT EXISTS ix_contrib_month ON contributions (month);
+CREATE INDEX IF NOT EXISTS ix_contrib_path ON contributions (path);
+CREATE INDEX IF NOT EXISTS ix_contrib_ts ON contributions (ts);
+CREATE INDEX IF NOT EXISTS ix_skill_scores_skill ON skill_scores (skill);
+"""
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """Open (and initialise) a scan database in WAL mode."""
+    conn = sqlite3.connect(path, timeout=30.0)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _ts(date: str) -> float:
+    """Epoch seconds for an ISO date/datetime (naive values are taken as UTC)."""
+    value = dt.datetime.fromisoformat(date)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=dt.timezone.utc)
+    return value.timestamp()
+
+
+def _rows_by_commit(scan: Dict[str, Any]) -> Dict[str, Dict[str, List[Tuple]]]:
+    """Group the commit, file and contribution rows of *scan* by commit hash."""
+    grouped: Dict[str, Dict[str, List[Tuple]]] = {}
+
+    def rows(h: str) -> Dict[str, List[Tuple]]:
+        return grouped.setdefault(h, {"commits": [], "files": [], "contribs": []})
+
+    for c in scan.get("commits", []):
+        rows(c["hash"])["commits"].append(
+            (
+                c["hash"],
+                c["author"],
+                c["date"],
+                _ts(c["date"]),
+                c["total_lines_changed"],
+            )
+        )
+        for f in c["files"]:
+            rows(c["hash"])["files"].append(
+                (
+                    c["hash"],
+                    f["path"],
+                    f["lines_added"],
+                    f["lines_deleted"],
+                    f["change_type"],
+                )
+            )
+    for r in scan.get("raw_rows", []):
+        rows(r["commit"])["contribs"].append(
+            (
+                r["commit"],
+                r["author"],
+                r["date"],
+                _ts(r["date"]),
+                month_bucket(dt.datetime.fromisoformat(r["date"])),
+                r["path"],
+                r["skill"],
+                r["lines_added"],
+                r["lines_deleted"],
+                r["score"],
+            )
+        )
+    return grouped
+
+
+def _replace_commits(
+    conn: sqlite3.Connection, hashes: List[str], grouped: Dict[str, Any]
+) -> None:
+    """Delete and re-insert every row of *hashes* (caller holds the transaction).
+
+    ``skill_scores`` is recomputed for the (author, skill) pairs touched, so it
+    matches ``contributions`` once the transaction commits.
+    """
+    keys = [(h,) for h in hashes]
+    pairs = {
+        (author, skill)
+        for (h,) in keys
+        for author, skill in conn.execute(
+            "SELECT DISTINCT author, skill FROM contributions WHERE commit_hash = ?",
+            (h,),
+        )
+    }
+    pairs.update((r[1], r[6]) for h in hashes for r in grouped[h]["contribs"])
+    conn.executemany("DELETE FROM contributions WHERE commit_hash = ?", keys)
+    conn.executemany("DELETE FROM file_contributions WHERE commit_hash = ?", keys)
+    conn.executemany(
+        "INSERT OR REPLACE INTO commits VALUES (?, ?, ?, ?, ?)",
+        [row for h in hashes for row in grouped[h]["commits"]],
+    )
+    conn.executemany(
+        "INSERT OR REPLACE INTO file_contributions VALUES (?, ?, ?, ?, ?)",
+        [row for h in hashes for row in grouped[h]["files"]],
+    )
+    conn.executemany(
+        "INSERT INTO contributions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT (commit_hash, path, skill, author) DO UPDATE SET "
+        "lines_added = excluded.lines_added, "
+        "lines_deleted = excluded.lines_deleted, score = excluded.score",
+        [row for h in hashes for row in grouped[h]["contribs"]],
+    )
+    conn.executemany(
+        "DELETE FROM skill_scores WHERE author = ? AND skill = ?", sorted(pairs)
+    )
+    conn.executemany(
+        "INSERT INTO skill_scores "
+        "SELECT author, skill, SUM(score) FROM contributions "
+        "WHERE author = ? AND skill = ? GROUP BY author, skill",
+        sorted(pairs),
+    )
+
+
+def write_scan_db(scan: Dict[str, Any], path: str, batch_size: int = 5000) -> None:
+    """Append a scan dict to the SQLite database at *path*.
+
+    Commits in *scan* replace their earlier rows, so a rescan refreshes
+    decayed scores, weights, aliases and skills; commits outside it are kept.
+    Each batch of about *batch_size* rows replaces whole commits and their
+    ``skill_scores`` in one transaction, so readers never see a commit
+    half-replaced or totals out of step with the rows.
+    """
+    grouped = _rows_by_commit(scan)
+    batches: List[List[str]] = [[]]
+    size = 0
+    for h in sorted(grouped):
+        if size >= batch_size:
+            batches.append([])
+            size = 0
+        batches[-1].append(h)
+        size += sum(len(v) for v in grouped[h].values())
+
+    conn = connect(path)
+    try:
+        for hashes in batches:
+            with conn:
+                _replace_commits(conn, hashes, grouped)
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                [
+                    ("repo", scan.get("repo")),
+                    ("scanned_at", scan.get("scanned_at")),
+                ],
+            )
+    finally:
+        conn.close()
+
+
+def load_scan_db(
+    path: str,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    include_raw: bool = True,
+) -> Dict[str, Any]:
+    """Rebuild a scan dict from the database with SQL aggregation.
+
+    ``since``/``until`` (ISO, inclusive/exclusive) restrict contributions by
+    commit timestamp; without them the precomputed ``skill_scores`` are used.
+    """
+    conn = connect(path)
+    try:
+        where, args = [], []
+        if since:
+            where.append("ts >= ?")
+            args.append(_ts(since))
+        if until:
+            where.append("ts < ?")
+            args.append(_ts(until))
+        clause = f" WHERE {' AND '.join(where)}" if where else ""
+
+        per_author_skill: Dict[str, Dict[str, float]] = {}
+        if where:
+            rows = conn.execute(
+                "SELECT author, skill, SUM(score) FROM contributions"
+                f"{clause} GROUP BY author, skill",
+                args,
+            )
+        else:
+            rows = conn.execute("SELECT author, skill, score FROM skill_scores")
+        for author, skill, score in rows:
+            per_author_skill.setdefault(author, {})[skill] = score
+
+        trend_monthly: Dict[str, Dict[str, Dict[str, float]]] = {}
+        for month, author, skill, score in conn.execute(
+            "SELECT month, author, skill, SUM(score) FROM contributions"
+            f"{clause} GROUP BY month, author, skill ORDER BY month",
+            args,
+        ):
+            trend_monthly.setdefault(month, {}).setdefault(author, {})[skill] = score
+
+        trend_daily: Dict[str, Dict[str, Dict[str, float]]] = {}
+        for day, author, skill, score in conn.execute(
+            "SELECT substr(date, 1, 10) AS day, author, skill, SUM(score) "
+            f"FROM contributions{clause} GROUP BY day, author, skill ORDER BY day",
+            args,
+        ):
+            trend_daily.setdefault(day, {}).setdefault(author, {})[skill] = score
+
+        # contribution rows repeat a file once per skill; count it once
+        path_tree = new_node()
+        for file_path, author, score in conn.execute(
+            "SELECT path, author, SUM(score) FROM (SELECT DISTINCT commit_hash, "
+            f"path, author, score FROM contributions{clause}) GROUP BY path, author",
+            args,
+        ):
+            tree_add(path_tree, file_path, author, score)
+
+        raw_rows: List[Dict[str, Any]] = []
+        if include_raw:
+            cur = conn.execute(
+                "SELECT commit_hash AS 'commit', author, date, path, skill, "
+                f"lines_added, lines_deleted, score FROM contributions{clause} "
+                "ORDER BY ts",
+                args,
+            )
+            names = [d[0] for d in cur.description]
+            raw_rows = [dict(zip(names, row)) for row in cur]
+
+        meta = dict(conn.execute("SELECT key, value FROM meta"))
+    finally:
+        conn.close()
+
+    return {
+        "commits": [],
+        "per_author_skill": per_author_skill,
+        "trend_monthly": trend_monthly,
+        "trend_daily": trend_daily,
+        "path_tree": path_tree,
+        "raw_rows": raw_rows,
+        "scanned_at": meta.get("scanned_at"),
+        "repo": meta.get("repo"),
+    }
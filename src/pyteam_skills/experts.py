@@ -0,0 +1,124 @@
+"""Precomputed expert index for fast top-K "who knows X" lookups."""
+
+from __future__ import annotations
+from bisect import bisect_left
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+import heapq
+import json
+import re
+
+Ranked = List[Tuple[str, float]]
+
+
+def _ranked(scores: Dict[str, float]) -> Ranked:
+    """Return ``(name, score)`` pairs sorted by score desc, then name."""
+    return sorted(scores.items(), key=lambda kv: (-kv[1], kv[0]))
+
+
+def _top(scores: Dict[str, float], k: int) -> Ranked:
+    """Heap-based top-K of a score dict (ties broken by name)."""
+    return heapq.nsmallest(k, scores.items(), key=lambda kv: (-kv[1], kv[0]))
+
+
+def _month_bound(value: Optional[str]) -> Optional[str]:
+    """Cut an ISO month/date/datetime bound to its ``YYYY-MM`` month key."""
+    if value is None:
+        return None
+    if not re.match(r"^\d{4}-\d{2}(-|T|$)", value):
+        raise ValueError(f"Expected a YYYY-MM month or ISO date, got '{value}'.")
+    return value[:7]
+
+
+@dataclass
+class ExpertIndex:
+    """Per-skill / per-author sorted arrays plus monthly and per-path scores."""
+
+    by_skill: Dict[str, Ranked] = field(default_factory=dict)
+    by_author: Dict[str, Ranked] = field(default_factory=dict)
+    monthly: Dict[str, Dict[str, Dict[str, float]]] = field(default_factory=dict)
+    paths: List[str] = field(default_factory=list)
+    path_scores: List[Dict[str, float]] = field(default_factory=list)
+
+    @classmethod
+    def from_scan(cls, scan: Dict[str, Any]) -> "ExpertIndex":
+        """Build the index from a scan's ``per_author_skill``, trends and raw rows."""
+        skills: Dict[str, Dict[str, float]] = {}
+        for author, by_skill in scan["per_author_skill"].items():
+            for skill, score in by_skill.items():
+                skills.setdefault(skill, {})[author] = score
+
+        # month -> skill -> author -> score
+        monthly: Dict[str, Dict[str, Dict[str, float]]] = {}
+        for month, by_author in scan.get("trend_monthly", {}).items():
+            for author, by_skill in by_author.items():
+                for skill, score in by_skill.items():
+                    monthly.setdefault(month, {}).setdefault(skill, {})[author] = score
+
+        # raw rows repeat a file once per skill; count each (commit, path) once
+        per_path: Dict[str, Dict[str, float]] = {}
+        seen = set()
+        for row in scan.get("raw_rows", []):
+            key = (row["commit"], row["path"], row["author"])
+            if key in seen:
+                continue
+            seen.add(key)
+            scores = per_path.setdefault(row["path"], {})
+            scores[row["author"]] = scores.get(row["author"], 0.0) + row["score"]
+        paths = sorted(per_path)
+
+        return cls(
+            by_skill={s: _ranked(a) for s, a in skills.items()},
+            by_author={a: _ranked(s) for a, s in scan["per_author_skill"].items()},
+            monthly=monthly,
+            paths=paths,
+            path_scores=[per_path[p] for p in paths],
+        )
+
+    @classmethod
+    def from_file(cls, path: str) -> "ExpertIndex":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        for key in ("by_skill", "by_author"):
+            data[key] = {k: [tuple(x) for x in v] for k, v in data[key].items()}
+        return cls(**data)
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(asdict(self), f)
+
+    def top_for_skill(
+        self,
+        skill: str,
+        k: int = 5,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> Ranked:
+        """Top-K authors for *skill*, optionally within months ``[since, until]``.
+
+        Bounds may be ``YYYY-MM`` or ISO dates; only their month is used.
+        """
+        since, until = _month_bound(since), _month_bound(until)
+        if since is None and until is None:
+            return self.by_skill.get(skill, [])[:k]
+        totals: Dict[str, float] = {}
+        for month, by_skill in self.monthly.items():
+            if (since and month < since) or (until and month > until):
+                continue
+            for author, score in by_skill.get(skill, {}).items():
+                totals[author] = totals.get(author, 0.0) + score
+        return _top(totals, k)
+
+    def top_for_author(self, author: str, k: int = 5) -> Ranked:
+        """Top-K skills for *author*."""
+        return self.by_author.get(author, [])[:k]
+
+    def top_for_path(self, prefix: str, k: int = 5) -> Ranked:
+        """Top-K authors across all files whose path starts with *prefix*."""
+        totals: Dict[str, float] = {}
+        i = bisect_left(self.paths, prefix)
+        while i < len(self.paths) and self.paths[i].startswith(prefix):
+            for author, score in self.path_scores[i].items():
+                totals[author] = totals.get(author, 0.0) + score
+            i += 1
+        return _top(totals, k)
@@ -1,27 +1,79 @@
 """Matrix builders and exporters (no plotting here)."""
 
 from __future__ import annotations
-from typing import Any, Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, IO, Iterable, List, Optional
+import csv
+import gzip
+import io
 import os
 
+import numpy as np
 import pandas as pd
 
+from .pathtree import export_directories
+from .rollups import trends_for
+
+RAW_COLUMNS = [
+    "commit",
+    "author",
+    "date",
+    "path",
+    "skill",
+    "lines_added",
+    "lines_deleted",
+    "score",
+]
+_SUFFIX = {None: "", "gzip": ".gz", "zstd": ".zst"}
+
+
+def _is_sparse(col: pd.Series) -> bool:
+    return isinstance(col.dtype, pd.SparseDtype)
+
 
 def _normalize_matrix(df: pd.DataFrame) -> pd.DataFrame:
-    """Normalize each skill column so the top author is 100 (rounded to 2)."""
+    """Normalize each skill column so the top author is 100 (rounded to 2).
+
+    Sparse columns stay sparse: only their stored non-zeros are rescaled.
+    """
     norm = df.copy()
     for col in norm.columns:
         m = float(norm[col].max()) if len(norm[col]) else 0.0
-        if m and m > 0:
+        if _is_sparse(norm[col]):
+            arr = norm[col].array
+            values = (arr.sp_values / m) * 100.0 if m and m > 0 else arr.sp_values
+            norm[col] = pd.arrays.SparseArray(
+                np.round(values, 2), sparse_index=arr.sp_index, fill_value=0.0
+            )
+        elif m and m > 0:
             norm[col] = (norm[col] / m) * 100.0
+    if all(_is_sparse(norm[c]) for c in norm.columns):
+        return norm
     return norm.round(2)
 
 
-def build_skill_matrix(scan: Dict[str, Any]) -> pd.DataFrame:
-    """Build author×skill matrix from aggregated scan dict."""
+def build_skill_matrix(scan: Dict[str, Any], sparse: bool = False) -> pd.DataFrame:
+    """Build author×skill matrix from aggregated scan dict.
+
+    With ``sparse=True`` each skill column is a pandas ``SparseArray`` that
+    only stores the authors who touched it.
+    """
     data = scan["per_author_skill"]
     skills = sorted({s for a in data for s in data[a]})
     authors = sorted(data.keys())
+    if sparse:
+        row_of = {a: i for i, a in enumerate(authors)}
+        coo: Dict[str, Dict[int, float]] = {s: {} for s in skills}
+        for a, sm in data.items():
+            for s, v in sm.items():
+                coo[s][row_of[a]] = v
+        columns = {}
+        for s in skills:
+            # one transient dense column at a time; only non-zeros are kept
+            col = np.zeros(len(authors))
+            col[list(coo[s])] = list(coo[s].values())
+            columns[s] = pd.arrays.SparseArray(col, fill_value=0.0)
+        return pd.DataFrame(columns, index=authors, columns=skills)
     mat = pd.DataFrame(0.0, index=authors, columns=skills, dtype=float)
     for a, sm in data.items():
         for s, v in sm.items():
@@ -29,46 +81,218 @@ def build_skill_matrix(scan: Dict[str, Any]) -> pd.DataFrame:
     return mat
 
 
-def build_trends(scan: Dict[str, Any]) -> pd.DataFrame:
-    """Build monthly trend rows and add per (month, skill) normalization 1–100."""
+def build_trends(scan: Dict[str, Any], granularity: str = "month") -> pd.DataFrame:
+    """Build trend rows and add per (bucket, skill) normalization 1–100.
+
+    The bucket column is named after *granularity* (week, month, quarter,
+    year); non-monthly buckets are rolled up from the scan's daily trends.
+    """
     rows: List[Dict[str, Any]] = []
-    for month, by_author in scan["trend_monthly"].items():
+    for bucket, by_author in trends_for(scan, granularity).items():
         for author, by_skill in by_author.items():
             for skill, score in by_skill.items():
                 rows.append(
-                    {"month": month, "author": author, "skill": skill, "score": score}
+                    {
+                        granularity: bucket,
+                        "author": author,
+                        "skill": skill,
+                        "score": score,
+                    }
                 )
     df = pd.DataFrame(rows)
     if not df.empty:
         df["norm"] = (
-            df.groupby(["month", "skill"])["score"]
+            df.groupby([granularity, "skill"])["score"]
             .transform(lambda s: (s / s.max()) * 100 if s.max() > 0 else 0)
             .round(2)
         )
     return df
 
 
-def export_csvs(scan: Dict[str, Any], out_dir: str) -> Dict[str, str]:
-    """Export matrix, normalized matrix, trends, and raw rows as CSV files."""
+def to_long(mat: pd.DataFrame, norm: pd.DataFrame) -> pd.DataFrame:
+    """Long-format ``author, skill, score, norm`` rows for non-zero cells only."""
+    frames = []
+    for col in mat.columns:
+        if _is_sparse(mat[col]):
+            arr = mat[col].array
+            rows, values = arr.sp_index.indices, arr.sp_values
+        else:
+            values = mat[col].to_numpy()
+            rows = np.flatnonzero(values)
+            values = values[rows]
+        keep = values != 0
+        rows, values = rows[keep], values[keep]
+        frames.append(
+            pd.DataFrame(
+                {
+                    "author": mat.index[rows],
+                    "skill": col,
+                    "score": values,
+                    "norm": norm[col].to_numpy()[rows],
+                }
+            )
+        )
+    if not frames:
+        return pd.DataFrame(columns=["author", "skill", "score", "norm"])
+    return pd.concat(frames, ignore_index=True)
+
+
+def build_directory_table(scan: Dict[str, Any], max_depth: int = 3) -> pd.DataFrame:
+    """Per-directory ownership rows (top authors, bus factor) from ``path_tree``."""
+    rows = export_directories(scan["path_tree"], max_depth=max_depth)
+    for r in rows:
+        r["top_authors"] = "; ".join(f"{a} ({v:.1f})" for a, v in r["top_authors"])
+    return pd.DataFrame(
+        rows,
+        columns=["path", "depth", "score", "authors", "bus_factor", "top_authors"],
+    )
+
+
+def _open_text(path: str, compress: Optional[str]) -> IO[str]:
+    """Open *path* for text writing, optionally through gzip or zstd."""
+    if compress is None:
+        return open(path, "w", encoding="utf-8", newline="")
+    if compress == "gzip":
+        return gzip.open(path, "wt", encoding="utf-8", newline="", compresslevel=6)
+    if compress == "zstd":
+        try:
+            import zstandard
+        except ImportError as e:
+            raise RuntimeError("zstd output requires 'pip install zstandard'.") from e
+        raw = zstandard.ZstdCompressor().stream_writer(open(path, "wb"))
+        return io.TextIOWrapper(raw, encoding="utf-8", newline="")
+    raise ValueError(f"Unknown compression '{compress}' (use gzip or zstd).")
+
+
+def _chunks(rows: List[Dict[str, Any]], size: int) -> Iterable[List[Dict[str, Any]]]:
+    for i in range(0, len(rows), size):
+        yield rows[i : i + size]
+
+
+def _write_raw_csv(
+    rows: List[Dict[str, Any]], path: str, compress: Optional[str], chunk_size: int
+) -> None:
+    """Stream raw contribution rows to CSV in chunks, without a DataFrame."""
+    with _open_text(path, compress) as f:
+        fields = list(rows[0]) if rows else RAW_COLUMNS
+        # "\n" like the pandas-written artifacts (csv defaults to "\r\n")
+        writer = csv.DictWriter(
+            f, fieldnames=fields, extrasaction="ignore", lineterminator="\n"
+        )
+        writer.writeheader()
+        for chunk in _chunks(rows, chunk_size):
+            writer.writerows(chunk)
+
+
+def _write_raw_parquet(
+    rows: List[Dict[str, Any]], path: str, compress: Optional[str], chunk_size: int
+) -> None:
+    """Stream raw contribution rows to Parquet one row group per chunk."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema(
+        [
+            ("commit", pa.string()),
+            ("author", pa.string()),
+            ("date", pa.string()),
+            ("path", pa.string()),
+            ("skill", pa.string()),
+            ("lines_added", pa.int64()),
+            ("lines_deleted", pa.int64()),
+            ("score", pa.float64()),
+        ]
+    )
+    with pq.ParquetWriter(path, schema, compression=compress or "snappy") as writer:
+        for chunk in _chunks(rows, chunk_size):
+            writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
+
+
+def export_csvs(
+    scan: Dict[str, Any],
+    out_dir: str,
+    compress: Optional[str] = None,
+    fmt: str = "csv",
+    chunk_size: int = 50_000,
+    sparse: bool = False,
+    granularity: str = "month",
+) -> Dict[str, str]:
+    """Export matrix, normalized matrix, trends, and raw rows as CSV files.
+
+    Artifacts are written concurrently; raw rows are streamed in chunks.
+    ``compress`` may be ``"gzip"`` or ``"zstd"``; ``fmt="parquet"`` writes
+    Parquet files instead (requires pyarrow). A long-format
+    ``skill_matrix_long`` (non-zero cells only) is always written; with
+    ``sparse=True`` the matrix is kept sparse and the two dense matrix
+    files are skipped.
+    """
+    if compress not in _SUFFIX:
+        raise ValueError(f"Unknown compression '{compress}' (use gzip or zstd).")
+    if fmt == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as e:
+            raise RuntimeError("Parquet output requires 'pip install pyarrow'.") from e
+        ext = ".parquet"
+    elif fmt == "csv":
+        ext = ".csv" + _SUFFIX[compress]
+    else:
+        raise ValueError(f"Unknown format '{fmt}' (use csv or parquet).")
 
     os.makedirs(out_dir, exist_ok=True)
-    mat = build_skill_matrix(scan)
+    mat = build_skill_matrix(scan, sparse=sparse)
     norm = _normalize_matrix(mat)
-    trends = build_trends(scan)
-
-    p1 = os.path.join(out_dir, "skill_matrix.csv")
-    p2 = os.path.join(out_dir, "skill_matrix_normalized.csv")
-    p3 = os.path.join(out_dir, "skill_trends.csv")
-    p4 = os.path.join(out_dir, "raw_contributions.csv")
-
-    mat.to_csv(p1)
-    norm.to_csv(p2)
-    trends.to_csv(p3, index=False)
-
-    pd.DataFrame(scan["raw_rows"]).to_csv(p4, index=False)
-    return {
-        "skill_matrix": p1,
-        "skill_matrix_normalized": p2,
-        "skill_trends": p3,
-        "raw_contributions": p4,
+    trends = build_trends(scan, granularity)
+    paths = {
+        name: os.path.join(out_dir, name + ext)
+        for name in (
+            "skill_matrix",
+            "skill_matrix_normalized",
+            "skill_matrix_long",
+            "skill_trends",
+            "raw_contributions",
+        )
     }
+
+    def write_frame(df: pd.DataFrame, path: str, index: bool) -> None:
+        if fmt == "parquet":
+            df.to_parquet(path, index=index, compression=compress or "snappy")
+        else:
+            with _open_text(path, compress) as f:
+                df.to_csv(f, index=index)
+
+    write_raw = _write_raw_parquet if fmt == "parquet" else _write_raw_csv
+    if sparse:
+        del paths["skill_matrix"], paths["skill_matrix_normalized"]
+    if "path_tree" in scan:
+        paths["directory_ownership"] = os.path.join(
+            out_dir, "directory_ownership" + ext
+        )
+    with ThreadPoolExecutor(max_workers=len(paths)) as pool:
+        jobs = [
+            pool.submit(
+                write_frame, to_long(mat, norm), paths["skill_matrix_long"], False
+            ),
+            pool.submit(write_frame, trends, paths["skill_trends"], False),
+            pool.submit(
+                write_raw,
+                scan["raw_rows"],
+                paths["raw_contributions"],
+                compress,
+                chunk_size,
+            ),
+        ]
+        if "path_tree" in scan:
+            dirs = build_directory_table(scan)
+            jobs.append(
+                pool.submit(write_frame, dirs, paths["directory_ownership"], False)
+            )
+        if not sparse:
+            jobs.append(pool.submit(write_frame, mat, paths["skill_matrix"], True))
+            jobs.append(
+                pool.submit(write_frame, norm, paths["skill_matrix_normalized"], True)
+            )
+        for job in jobs:
+            job.result()
+
+    return paths
@@ -0,0 +1,197 @@
+"""Current-ownership scoring from ``git blame`` over the files at a revision."""
+
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+import datetime as dt
+import json
+import os
+import subprocess
+
+from .config import Config
+from .pathtree import new_node, tree_add
+from .repo_scan import _content_classifier, _find_git_root
+from .utils import day_bucket, file_skills, matches_any, normalize_author
+
+# "path\0blob sha" -> raw author -> authoring day -> surviving lines
+BlameCache = Dict[str, Dict[str, Dict[str, int]]]
+
+CACHE_VERSION = 3
+
+
+def _cache_key(path: str, sha: str) -> str:
+    """Blame depends on a path's history, so identical blobs at two paths differ."""
+    return f"{path}\0{sha}"
+
+
+def _git(root: str, *args: str) -> str:
+    """Run a git command inside *root* and return its stdout."""
+    res = subprocess.run(
+        ["git", "-C", root, *args],
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+    )
+    if res.returncode != 0:
+        raise RuntimeError(f"git {' '.join(args)} failed: {res.stderr.strip()}")
+    return res.stdout
+
+
+def _list_blobs(root: str, rev: str) -> List[Tuple[str, str]]:
+    """Return ``(path, blob_sha)`` for every file tracked at *rev*."""
+    out = _git(root, "ls-tree", "-r", "-z", "--full-tree", rev)
+    blobs: List[Tuple[str, str]] = []
+    for entry in out.split("\0"):
+        if not entry:
+            continue
+        meta, path = entry.split("\t", 1)
+        _mode, kind, sha = meta.split()
+        if kind == "blob":
+            blobs.append((path, sha))
+    return blobs
+
+
+def _parse_porcelain(text: str) -> Dict[str, Dict[str, int]]:
+    """Count lines per author and authoring day from ``blame --porcelain``."""
+    authors: Dict[str, Dict[str, str]] = {}
+    counts: Dict[str, Dict[str, int]] = {}
+    current: Optional[str] = None
+    for line in text.splitlines():
+        if line.startswith("\t"):
+            info = authors.get(current or "", {})
+            author = f"{info.get('author', '')} {info.get('author-mail', '')}".strip()
+            when = dt.datetime.fromtimestamp(
+                int(info.get("author-time", "0")), dt.timezone.utc
+            )
+            day = day_bucket(when)
+            by_day = counts.setdefault(author, {})
+            by_day[day] = by_day.get(day, 0) + 1
+            continue
+        key, _, value = line.partition(" ")
+        parts = line.split()
+        if len(parts) in (3, 4) and len(key) in (40, 64) and parts[1].isdigit():
+            current = key
+            authors.setdefault(current, {})
+        elif current is not None and key in ("author", "author-mail", "author-time"):
+            authors[current][key] = value
+    return counts
+
+
+def _blame_file(root: str, rev: str, path: str) -> Dict[str, Dict[str, int]]:
+    """Blame a single file at *rev* and return its per-author line counts."""
+    return _parse_porcelain(_git(root, "blame", "--porcelain", rev, "--", path))
+
+
+def load_blame_cache(path: Optional[str]) -> BlameCache:
+    """Load a (path, blob)-keyed blame cache; empty if missing or stale."""
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("version") != CACHE_VERSION:
+        return {}
+    return data.get("blobs", {})
+
+
+def save_blame_cache(path: str, cache: BlameCache) -> None:
+    """Persist the blame cache as JSON."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"version": CACHE_VERSION, "blobs": cache}, f)
+
+
+def blame_ownership(
+    repo_path: str,
+    cfg: Config,
+    rev: str = "HEAD",
+    workers: Optional[int] = None,
+    cache_path: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Attribute surviving lines at *rev* to their authors via ``git blame``.
+
+    Files are blamed in parallel and results are cached by path and blob
+    SHA, so a rerun only blames files whose content changed. Scores are surviving line
+    counts (no decay) in the same ``per_author_skill`` shape as ``scan_repo``.
+    """
+    root = _find_git_root(repo_path)
+    if root is None:
+        raise RuntimeError(f"Path '{repo_path}' is not inside a Git repository.")
+
+    head = _git(root, "rev-parse", "--verify", f"{rev}^{{commit}}").strip()
+    head_date = _git(root, "show", "-s", "--format=%aI", head).strip()
+    blobs = _list_blobs(root, head)
+
+    cache = load_blame_cache(cache_path)
+    sha_of = dict(blobs)
+    missing = [path for path, sha in blobs if _cache_key(path, sha) not in cache]
+    if missing:
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            results = pool.map(lambda path: _blame_file(root, head, path), missing)
+            for path, counts in zip(missing, results):
+                cache[_cache_key(path, sha_of[path])] = counts
+    # keep only entries for files at this rev, so the cache doesn't grow forever
+    cache = {key: cache[key] for key in (_cache_key(p, sha) for p, sha in blobs)}
+    if cache_path:
+        save_blame_cache(cache_path, cache)
+
+    per_author_skill: Dict[str, Dict[str, float]] = {}
+    trend_monthly: Dict[str, Dict[str, Dict[str, float]]] = {}
+    trend_daily: Dict[str, Dict[str, Dict[str, float]]] = {}
+    path_tree = new_node()
+    raw_rows: List[Dict[str, Any]] = []
+
+    content = _content_classifier(root, cfg)
+    try:
+        for path, sha in blobs:
+            matched = content.skills(sha) if content else None
+            skills = file_skills(
+                path, cfg.extension_skills, cfg.path_skills, cfg.regex_skills, matched
+            )
+            for raw_author, by_day in cache[_cache_key(path, sha)].items():
+                author = normalize_author(raw_author, cfg.author_aliases)
+                if matches_any(author, cfg.ignore_authors):
+                    continue
+                lines = sum(by_day.values())
+                tree_add(path_tree, path, author, float(lines))
+                for skill in skills:
+                    per_author_skill.setdefault(author, {}).setdefault(skill, 0.0)
+                    per_author_skill[author][skill] += lines
+                    for day, n in by_day.items():
+                        month = day[:7]
+                        for trend, bucket in (
+                            (trend_daily, day),
+                            (trend_monthly, month),
+                        ):
+                            trend.setdefault(bucket, {}).setdefault(
+                                author, {}
+                            ).setdefault(skill, 0.0)
+                            trend[bucket][author][skill] += n
+                    raw_rows.append(
+                        {
+                            "commit": head,
+                            "author": author,
+                            "date": head_date,
+                            "path": path,
+                            "skill": skill,
+                            "lines_added": lines,
+                            "lines_deleted": 0,
+                            "score": float(lines),
+                        }
+                    )
+    finally:
+        if content is not None:
+            content.close()
+
+    return {
+        "commits": [],
+        "per_author_skill": per_author_skill,
+        "trend_monthly": trend_monthly,
+        "trend_daily": trend_daily,
+        "path_tree": path_tree,
+        "raw_rows": raw_rows,
+        "scanned_at": dt.datetime.now(dt.timezone.utc).isoformat(),
+        "repo": os.path.abspath(root),
+        "mode": "ownership",
+        "rev": head,
+    }
@@ -0,0 +1,91 @@
+"""Directory-tree expertise index: per-path author scores and bus factor.
+
+The tree is a plain nested dict (JSON-friendly, stored in the scan as
+``path_tree``)::
+
+    {"scores": {author: score}, "children": {name: <node>, ...}}
+
+Adding a file contribution credits every ancestor directory as well, so each
+node already holds the rolled-up scores of its whole subtree and queries
+never re-walk contributions.
+"""
+
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Tuple
+import heapq
+
+Node = Dict[str, Any]
+
+
+def new_node() -> Node:
+    return {"scores": {}, "children": {}}
+
+
+def _parts(path: str) -> List[str]:
+    return [p for p in path.strip("/").split("/") if p]
+
+
+def tree_add(root: Node, path: str, author: str, score: float) -> None:
+    """Credit *author* with *score* on *path* and all of its ancestors."""
+    node = root
+    node["scores"][author] = node["scores"].get(author, 0.0) + score
+    for part in _parts(path):
+        node = node["children"].setdefault(part, new_node())
+        node["scores"][author] = node["scores"].get(author, 0.0) + score
+
+
+def find_node(root: Node, path: str) -> Optional[Node]:
+    """Return the node for *path* (file or directory), or None."""
+    node = root
+    for part in _parts(path):
+        node = node["children"].get(part)
+        if node is None:
+            return None
+    return node
+
+
+def top_authors(scores: Dict[str, float], k: int = 5) -> List[Tuple[str, float]]:
+    """Top-K ``(author, score)`` pairs, highest first."""
+    return heapq.nsmallest(k, scores.items(), key=lambda kv: (-kv[1], kv[0]))
+
+
+def bus_factor(scores: Dict[str, float], threshold: float = 0.5) -> int:
+    """Smallest number of authors who together hold *threshold* of the score."""
+    total = sum(scores.values())
+    if total <= 0:
+        return 0
+    acc = 0.0
+    for n, value in enumerate(sorted(scores.values(), reverse=True), 1):
+        acc += value
+        if acc >= threshold * total:
+            return n
+    return len(scores)
+
+
+def export_directories(
+    root: Node, max_depth: int = 3, k: int = 3
+) -> List[Dict[str, Any]]:
+    """Flatten directory nodes (not files) down to *max_depth* for export."""
+    rows: List[Dict[str, Any]] = []
+
+    def walk(node: Node, prefix: str, depth: int) -> None:
+        for name in sorted(node["children"]):
+            child = node["children"][name]
+            if not child["children"]:
+                continue  # a file
+            path = f"{prefix}{name}/"
+            rows.append(
+                {
+                    "path": path,
+                    "depth": depth,
+                    "score": sum(child["scores"].values()),
+                    "authors": len(child["scores"]),
+                    "bus_factor": bus_factor(child["scores"]),
+                    "top_authors": top_authors(child["scores"], k),
+                }
+            )
+            if depth < max_depth:
+                walk(child, path, depth + 1)
+
+    walk(root, "", 1)
+    return rows
@@ -5,12 +5,24 @@ from dataclasses import dataclass, asdict
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 import datetime as dt
+import json
 import os
 
 from pydriller import Repository
 
 from .config import Config
-from .utils import exp_decay, file_skills, matches_any, month_bucket, normalize_author
+from .content import BlobIndex, ContentClassifier
+from .pathtree import new_node, tree_add
+from .utils import (
+    day_bucket,
+    exp_decay,
+    file_skills,
+    matches_any,
+    month_bucket,
+    normalize_author,
+)
+
+RAW_CACHE_VERSION = 2
 
 
 @dataclass
@@ -35,19 +47,148 @@ class CommitRecord:
     total_lines_changed: int
 
 
+def _is_bare_repo(path: Path) -> bool:
+    """True if *path* is itself a Git directory (bare repo or ``--mirror`` clone)."""
+    return (
+        (path / "HEAD").is_file()
+        and (path / "objects").is_dir()
+        and (path / "refs").is_dir()
+    )
+
+
 def _find_git_root(start: str) -> Optional[str]:
-    """Return the closest parent directory containing a .git folder."""
+    """Return the closest parent that has a .git entry or is a bare repository."""
     p = Path(start).resolve()
     for parent in [p, *p.parents]:
-        if (parent / ".git").exists():
+        if (parent / ".git").exists() or _is_bare_repo(parent):
             return str(parent)
     return None
 
 
+def _raw_commit(commit: Any, blobs: Optional[BlobIndex] = None) -> Dict[str, Any]:
+    """Config-independent per-file stats of a PyDriller commit.
+
+    With a *blobs* index, surviving files also record their blob SHA.
+    """
+    files: List[Dict[str, Any]] = []
+    for m in commit.modified_files:
+        path = m.new_path or m.old_path or ""
+        if not path:
+            continue
+        ct = (
+            str(m.change_type.name)
+            if hasattr(m.change_type, "name")
+            else str(m.change_type)
+        )
+        stats = {
+            "path": path,
+            "lines_added": m.added_lines or 0,
+            "lines_deleted": m.deleted_lines or 0,
+            "change_type": ct,
+        }
+        if blobs is not None and m.new_path:
+            stats["blob"] = blobs.blob_sha(commit.hash, m.new_path)
+        files.append(stats)
+    return {
+        "hash": commit.hash,
+        "author": f"{commit.author.name} <{commit.author.email}>",
+        "date": commit.author_date.isoformat(),
+        "files": files,
+    }
+
+
+def _classify(
+    raw: Dict[str, Any],
+    cfg: Config,
+    skills_cache: Optional[Dict[str, List[str]]] = None,
+    content: Optional[ContentClassifier] = None,
+) -> Optional[CommitRecord]:
+    """Apply aliases, ignore rules and skill mapping to raw commit stats.
+
+    ``skills_cache`` memoizes ``file_skills`` per path (and content match)
+    across commits; *content* applies ``content_skills`` to recorded blobs.
+    """
+    norm_author = normalize_author(raw["author"], cfg.author_aliases)
+    if matches_any(norm_author, cfg.ignore_authors):
+        return None
+    if skills_cache is None:
+        skills_cache = {}
+
+    file_contribs: List[FileContribution] = []
+    total_changed = 0
+    for f in raw["files"]:
+        path = f["path"]
+        matched = content.skills(f["blob"]) if content and f.get("blob") else None
+        key = path if matched is None else f"{path}\0{','.join(matched)}"
+        skills = skills_cache.get(key)
+        if skills is None:
+            skills = file_skills(
+                path, cfg.extension_skills, cfg.path_skills, cfg.regex_skills, matched
+            )
+            skills_cache[key] = skills
+        added, deleted = f["lines_added"], f["lines_deleted"]
+        total_changed += added + deleted
+        file_contribs.append(
+            FileContribution(path, skills, added, deleted, f["change_type"])
+        )
+
+    if not file_contribs:
+        return None
+    return CommitRecord(
+        raw["hash"], norm_author, raw["date"], file_contribs, total_changed
+    )
+
+
+def _commit_record(
+    commit: Any,
+    cfg: Config,
+    skills_cache: Optional[Dict[str, List[str]]] = None,
+    content: Optional[ContentClassifier] = None,
+) -> Optional[CommitRecord]:
+    """Classify a PyDriller commit; None if ignored or without file changes."""
+    author_str = f"{commit.author.name} <{commit.author.email}>"
+    if matches_any(
+        normalize_author(author_str, cfg.author_aliases), cfg.ignore_authors
+    ):
+        return None
+    return _classify(_raw_commit(commit, content), cfg, skills_cache, content)
+
+
+def _content_classifier(root: str, cfg: Config) -> Optional[ContentClassifier]:
+    """A blob classifier for ``cfg.content_skills``, or None when unused."""
+    if not cfg.content_skills:
+        return None
+    if _find_git_root(root) is None:
+        raise RuntimeError(
+            f"content_skills need the Git repository, but '{root}' is not one."
+        )
+    return ContentClassifier(root, cfg.content_skills)
+
+
+def file_score(
+    f: FileContribution, when: dt.datetime, cfg: Config, now: dt.datetime
+) -> float:
+    """Weighted, recency-decayed score of one file contribution."""
+    base = (
+        cfg.weights.get("lines_changed", 1.0) * (f.lines_added + f.lines_deleted)
+        + cfg.weights.get("files_touched", 0.0) * 1.0
+        + cfg.weights.get("commit_bonus", 0.0)
+    )
+    return exp_decay(base, when, now, cfg.decay_half_life_days)
+
+
 def scan_repo(
-    repo_path: str, cfg: Config, now: Optional[dt.datetime] = None
+    repo_path: str,
+    cfg: Config,
+    now: Optional[dt.datetime] = None,
+    raw_cache: Optional[str] = None,
 ) -> Dict[str, Any]:
-    """Scan a repo and return raw commits plus aggregated skill scores and trends."""
+    """Scan a repo and return raw commits plus aggregated skill scores and trends.
+
+    With ``raw_cache``, the config-independent per-file stats of every commit
+    (ignored authors included) and the blob SHA of each surviving file are
+    also written there for ``rescan``.
+    """
     since = dt.datetime.fromisoformat(cfg.time_since) if cfg.time_since else None
     to = dt.datetime.fromisoformat(cfg.time_until) if cfg.time_until else None
 
@@ -56,61 +197,122 @@ def scan_repo(
         raise RuntimeError(f"Path '{repo_path}' is not inside a Git repository.")
 
     commits: List[CommitRecord] = []
-    for commit in Repository(path_to_repo=root, since=since, to=to).traverse_commits():
-        author_str = f"{commit.author.name} <{commit.author.email}>"
-        norm_author = normalize_author(author_str, cfg.author_aliases)
-        if matches_any(norm_author, cfg.ignore_authors):
-            continue
+    raws: List[Dict[str, Any]] = []
+    skills_cache: Dict[str, List[str]] = {}
+    content = _content_classifier(root, cfg)
+    # blob SHAs go into the raw cache even without content rules, for rescan
+    blobs = content or (BlobIndex(root) if raw_cache else None)
+    try:
+        repo = Repository(path_to_repo=root, since=since, to=to)
+        for commit in repo.traverse_commits():
+            if raw_cache:
+                raw = _raw_commit(commit, blobs)
+                raws.append(raw)
+                record = _classify(raw, cfg, skills_cache, content)
+            else:
+                record = _commit_record(commit, cfg, skills_cache, content)
+            if record is not None:
+                commits.append(record)
+    finally:
+        if blobs is not None:
+            blobs.close()
 
-        file_contribs: List[FileContribution] = []
-        total_changed = 0
-        for m in commit.modified_files:
-            path = m.new_path or m.old_path or ""
-            if not path:
-                continue
-            skills = file_skills(
-                path, cfg.extension_skills, cfg.path_skills, cfg.regex_skills
-            )
-            added = m.added_lines or 0
-            deleted = m.deleted_lines or 0
-            total_changed += added + deleted
-            ct = (
-                str(m.change_type.name)
-                if hasattr(m.change_type, "name")
-                else str(m.change_type)
-            )
-            file_contribs.append(FileContribution(path, skills, added, deleted, ct))
+    if raw_cache:
+        save_raw_cache(raw_cache, raws, os.path.abspath(root))
+    result = aggregate_commits(commits, cfg, now)
+    result["repo"] = os.path.abspath(root)
+    return result
 
-        if not file_contribs:
-            continue
 
-        commits.append(
-            CommitRecord(
-                commit.hash,
-                norm_author,
-                commit.author_date.isoformat(),
-                file_contribs,
-                total_changed,
-            )
-        )
+def save_raw_cache(path: str, raws: List[Dict[str, Any]], repo: str) -> None:
+    """Write raw per-commit file stats (see ``_raw_commit``) as JSON."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"version": RAW_CACHE_VERSION, "repo": repo, "commits": raws}, f)
+
+
+def load_raw_cache(path: str) -> Dict[str, Any]:
+    """Load a raw stats cache written by ``scan_repo(..., raw_cache=...)``."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("version") != RAW_CACHE_VERSION:
+        raise RuntimeError(f"Unsupported raw cache version in '{path}'.")
+    return data
 
+
+def _aware(bound: dt.datetime, like: dt.datetime) -> dt.datetime:
+    """Give a naive window bound the timezone of *like* so they compare."""
+    return bound.replace(tzinfo=like.tzinfo) if bound.tzinfo is None else bound
+
+
+def rescan(
+    cache_path: str, cfg: Config, now: Optional[dt.datetime] = None
+) -> Dict[str, Any]:
+    """Re-run classification, aliases and scoring over a raw cache, without git.
+
+    ``time_since``/``time_until`` of *cfg* narrow the cached commits further.
+    ``content_skills`` read the cached blob SHAs from the cached repo path.
+    """
+    data = load_raw_cache(cache_path)
+    since = dt.datetime.fromisoformat(cfg.time_since) if cfg.time_since else None
+    to = dt.datetime.fromisoformat(cfg.time_until) if cfg.time_until else None
+
+    commits: List[CommitRecord] = []
+    skills_cache: Dict[str, List[str]] = {}
+    content = _content_classifier(data["repo"], cfg) if data.get("repo") else None
+    try:
+        for raw in data["commits"]:
+            if since or to:
+                when = dt.datetime.fromisoformat(raw["date"])
+                if since and when < _aware(since, when):
+                    continue
+                if to and when > _aware(to, when):
+                    continue
+            record = _classify(raw, cfg, skills_cache, content)
+            if record is not None:
+                commits.append(record)
+    finally:
+        if content is not None:
+            content.close()
+
+    result = aggregate_commits(commits, cfg, now)
+    result["repo"] = data.get("repo")
+    return result
+
+
+def commit_from_dict(data: Dict[str, Any]) -> CommitRecord:
+    """Rebuild a CommitRecord from its ``asdict`` form (as stored in scan JSON)."""
+    files = [FileContribution(**f) for f in data["files"]]
+    return CommitRecord(
+        data["hash"], data["author"], data["date"], files, data["total_lines_changed"]
+    )
+
+
+def aggregate_commits(
+    commits: List[CommitRecord],
+    cfg: Config,
+    now: Optional[dt.datetime] = None,
+    weights: Optional[Dict[str, float]] = None,
+) -> Dict[str, Any]:
+    """Score commits into per-author skills, monthly trends and raw rows.
+
+    ``weights`` optionally scales each commit's scores by hash (used to
+    scale sampled commits back up to the population).
+    """
     now = now or dt.datetime.now(dt.timezone.utc)
-    half_life = cfg.decay_half_life_days
 
     per_author_skill: Dict[str, Dict[str, float]] = {}
     trend_monthly: Dict[str, Dict[str, Dict[str, float]]] = {}
+    trend_daily: Dict[str, Dict[str, Dict[str, float]]] = {}
+    path_tree = new_node()
     raw_rows: List[Dict[str, Any]] = []
 
     for c in commits:
         when = dt.datetime.fromisoformat(c.date)
+        scale = weights.get(c.hash, 1.0) if weights else 1.0
         for f in c.files:
-            base = (
-                cfg.weights.get("lines_changed", 1.0)
-                * (f.lines_added + f.lines_deleted)
-                + cfg.weights.get("files_touched", 0.0) * 1.0
-                + cfg.weights.get("commit_bonus", 0.0)
-            )
-            decayed = exp_decay(base, when, now, half_life)
+            decayed = file_score(f, when, cfg, now) * scale
+            tree_add(path_tree, f.path, c.author, decayed)
             for skill in f.skills:
                 per_author_skill.setdefault(c.author, {}).setdefault(skill, 0.0)
                 per_author_skill[c.author][skill] += decayed
@@ -121,6 +323,12 @@ def scan_repo(
                 )
                 trend_monthly[month][c.author][skill] += decayed
 
+                day = day_bucket(when)
+                trend_daily.setdefault(day, {}).setdefault(c.author, {}).setdefault(
+                    skill, 0.0
+                )
+                trend_daily[day][c.author][skill] += decayed
+
                 raw_rows.append(
                     {
                         "commit": c.hash,
@@ -138,7 +346,8 @@ def scan_repo(
         "commits": [asdict(x) for x in commits],
         "per_author_skill": per_author_skill,
         "trend_monthly": trend_monthly,
+        "trend_daily": trend_daily,
+        "path_tree": path_tree,
         "raw_rows": raw_rows,
         "scanned_at": dt.datetime.now(dt.timezone.utc).isoformat(),
-        "repo": os.path.abspath(root),
     }
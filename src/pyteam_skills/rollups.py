@@ -0,0 +1,76 @@
+"""Derive week/month/quarter/year trends from a scan's daily aggregate.
+
+Each author×skill series is turned into a cumulative sum over its sorted
+days; a bucket total is then the difference of two cumulative values found
+by binary search on the bucket's first day. Rolled-up trends are cached on
+the scan dict under ``trend_rollups`` so each granularity is computed once.
+"""
+
+from __future__ import annotations
+from typing import Any, Dict, List, Tuple
+import datetime as dt
+
+import numpy as np
+
+from .utils import BUCKETS
+
+Trend = Dict[str, Dict[str, Dict[str, float]]]
+
+
+def _bucket_starts(days: List[str], granularity: str) -> Tuple[List[str], List[str]]:
+    """Return bucket labels and each bucket's first day, for sorted *days*."""
+    bucket_of = BUCKETS[granularity]
+    labels: List[str] = []
+    starts: List[str] = []
+    for day in days:
+        label = bucket_of(dt.datetime.strptime(day, "%Y-%m-%d"))
+        if not labels or labels[-1] != label:
+            labels.append(label)
+            starts.append(day)
+    return labels, starts
+
+
+def rollup(trend_daily: Trend, granularity: str) -> Trend:
+    """Roll a daily ``{day: {author: {skill: score}}}`` trend up to *granularity*."""
+    if granularity not in BUCKETS:
+        raise ValueError(
+            f"Unknown granularity '{granularity}' (use {', '.join(BUCKETS)})."
+        )
+    days = sorted(trend_daily)
+    labels, starts = _bucket_starts(days, granularity)
+    # ISO day strings sort like dates, so bucket edges are searchable as strings
+    edges = np.array(starts + ["9999-99-99"])
+
+    series: Dict[Tuple[str, str], List[Tuple[str, float]]] = {}
+    for day in days:
+        for author, by_skill in trend_daily[day].items():
+            for skill, score in by_skill.items():
+                series.setdefault((author, skill), []).append((day, score))
+
+    out: Trend = {}
+    for (author, skill), points in series.items():
+        key_days = np.array([d for d, _ in points])
+        cum = np.concatenate(([0.0], np.cumsum([s for _, s in points])))
+        idx = np.searchsorted(key_days, edges)
+        totals = np.diff(cum[idx])
+        for b in np.flatnonzero(np.diff(idx)):
+            out.setdefault(labels[b], {}).setdefault(author, {})[skill] = float(
+                totals[b]
+            )
+    return {label: out[label] for label in labels if label in out}
+
+
+def trends_for(scan: Dict[str, Any], granularity: str = "month") -> Trend:
+    """Return the trend dict of *scan* at *granularity*, computing it once.
+
+    ``month`` reuses the scan's own ``trend_monthly``. Scans without
+    ``trend_daily`` (older scan files) only support ``month``.
+    """
+    if granularity == "month" and "trend_monthly" in scan:
+        return scan["trend_monthly"]
+    if "trend_daily" not in scan:
+        raise ValueError("This scan has no daily trends; only 'month' works.")
+    cache = scan.setdefault("trend_rollups", {})
+    if granularity not in cache:
+        cache[granularity] = rollup(scan["trend_daily"], granularity)
+    return cache[granularity]
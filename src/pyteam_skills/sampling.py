@@ -0,0 +1,236 @@
+"""Approximate scans over a stratified commit sample, with confidence intervals.
+
+Commits are stratified by (month range, author) from cheap ``git log``
+metadata, pooling light committers; only the sampled commits are diffed
+through PyDriller. Each sampled commit
+is weighted by ``N_h / n_h`` of its stratum, and per author x skill totals
+get a 95% interval from the stratified-sampling variance of the total.
+"""
+
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Tuple
+import datetime as dt
+import math
+import os
+import random
+
+from pydriller import Repository
+
+from .config import Config
+from .ownership import _git
+from .repo_scan import (
+    CommitRecord,
+    _commit_record,
+    _content_classifier,
+    _find_git_root,
+    aggregate_commits,
+    file_score,
+)
+from .utils import matches_any, month_bucket, normalize_author
+
+Z_95 = 1.96
+
+
+POOLED = "*"
+
+
+def _commit_log(root: str, cfg: Config) -> List[Tuple[str, str, str]]:
+    """``(month, normalized author, hash)`` of non-merge commits, oldest first."""
+    args = ["log", "--reverse", "--no-merges", "--format=%H%x1f%an <%ae>%x1f%aI"]
+    if cfg.time_since:
+        args.append(f"--since={cfg.time_since}")
+    if cfg.time_until:
+        args.append(f"--until={cfg.time_until}")
+    rows: List[Tuple[str, str, str]] = []
+    for line in _git(root, *args).splitlines():
+        if not line:
+            continue
+        sha, author, date = line.split("\x1f")
+        author = normalize_author(author, cfg.author_aliases)
+        if matches_any(author, cfg.ignore_authors):
+            continue
+        rows.append((month_bucket(dt.datetime.fromisoformat(date)), author, sha))
+    return rows
+
+
+def _chunk_months(
+    by_month: Dict[str, List[str]], target: int
+) -> List[Tuple[str, List[str]]]:
+    """Merge consecutive months until each chunk holds at least *target* commits.
+
+    A short tail joins the previous chunk; labels are ``first..last`` month.
+    """
+    chunks: List[Tuple[List[str], List[str]]] = []
+    months: List[str] = []
+    hashes: List[str] = []
+    for month in sorted(by_month):
+        months.append(month)
+        hashes.extend(by_month[month])
+        if len(hashes) >= target:
+            chunks.append((months, hashes))
+            months, hashes = [], []
+    if hashes:
+        if chunks:
+            chunks[-1][0].extend(months)
+            chunks[-1][1].extend(hashes)
+        else:
+            chunks.append((months, hashes))
+    return [(m[0] if m[0] == m[-1] else f"{m[0]}..{m[-1]}", h) for m, h in chunks]
+
+
+def _commit_strata(
+    root: str, cfg: Config, target: int = 1
+) -> Dict[Tuple[str, str], List[str]]:
+    """Group commit hashes into (month range, author) strata of >= *target* commits.
+
+    Busy authors get their own strata over as few consecutive months as
+    reach *target*; authors with fewer than *target* commits in total share
+    pooled (month range, ``"*"``) strata, so light committers don't force a
+    near-complete sample.
+    """
+    per_author: Dict[str, Dict[str, List[str]]] = {}
+    for month, author, sha in _commit_log(root, cfg):
+        per_author.setdefault(author, {}).setdefault(month, []).append(sha)
+
+    strata: Dict[Tuple[str, str], List[str]] = {}
+    pooled: Dict[str, List[str]] = {}
+    for author, by_month in per_author.items():
+        if sum(len(h) for h in by_month.values()) < target:
+            for month, hashes in by_month.items():
+                pooled.setdefault(month, []).extend(hashes)
+            continue
+        for label, hashes in _chunk_months(by_month, target):
+            strata[(label, author)] = hashes
+    for label, hashes in _chunk_months(pooled, target):
+        strata[(label, POOLED)] = hashes
+    return strata
+
+
+def _sample_strata(
+    strata: Dict[Tuple[str, str], List[str]],
+    rate: float,
+    min_per_stratum: int,
+    seed: int,
+) -> Dict[Tuple[str, str], List[str]]:
+    """Pick ``max(min_per_stratum, round(rate * N_h))`` commits per stratum."""
+    rng = random.Random(seed)
+    picked: Dict[Tuple[str, str], List[str]] = {}
+    for key in sorted(strata):
+        hashes = strata[key]
+        n = min(len(hashes), max(min_per_stratum, round(rate * len(hashes))))
+        picked[key] = rng.sample(hashes, n)
+    return picked
+
+
+def _intervals(
+    strata: Dict[Tuple[str, str], List[str]],
+    picked: Dict[Tuple[str, str], List[str]],
+    records: Dict[str, CommitRecord],
+    cfg: Config,
+    now: dt.datetime,
+) -> Dict[str, Dict[str, List[float]]]:
+    """95% intervals for each author x skill total estimate.
+
+    In pooled strata a commit contributes 0 to every other author's total.
+    """
+    # author -> skill -> [estimate, variance]
+    acc: Dict[str, Dict[str, List[float]]] = {}
+    for key, hashes in picked.items():
+        big_n, n = len(strata[key]), len(hashes)
+        # per-commit contribution to each (author, skill) (0 where untouched)
+        values: List[Dict[Tuple[str, str], float]] = []
+        for h in hashes:
+            per_skill: Dict[Tuple[str, str], float] = {}
+            c = records.get(h)
+            if c is not None:
+                when = dt.datetime.fromisoformat(c.date)
+                for f in c.files:
+                    score = file_score(f, when, cfg, now)
+                    for skill in f.skills:
+                        cell = (c.author, skill)
+                        per_skill[cell] = per_skill.get(cell, 0.0) + score
+            values.append(per_skill)
+        cells = {cell for v in values for cell in v}
+        for author, skill in cells:
+            xs = [v.get((author, skill), 0.0) for v in values]
+            mean = sum(xs) / n
+            if n > 1:
+                var = sum((x - mean) ** 2 for x in xs) / (n - 1)
+            else:
+                # one draw cannot estimate spread; use its square as a bound
+                var = xs[0] ** 2
+            fpc = 1.0 - n / big_n
+            est = acc.setdefault(author, {}).setdefault(skill, [0.0, 0.0])
+            est[0] += big_n * mean
+            est[1] += big_n * big_n * fpc * var / n
+
+    return {
+        author: {
+            skill: [
+                max(0.0, est - Z_95 * math.sqrt(var)),
+                est + Z_95 * math.sqrt(var),
+            ]
+            for skill, (est, var) in by_skill.items()
+        }
+        for author, by_skill in acc.items()
+    }
+
+
+def sample_scan(
+    repo_path: str,
+    cfg: Config,
+    rate: float = 0.05,
+    min_per_stratum: int = 1,
+    seed: int = 0,
+    now: Optional[dt.datetime] = None,
+) -> Dict[str, Any]:
+    """Approximate ``scan_repo`` from a stratified sample of commits.
+
+    Strata hold at least ``min_per_stratum / rate`` commits (see
+    ``_commit_strata``), so the sampled fraction stays close to *rate*.
+    Returns the usual scan dict with scores scaled back to the population,
+    plus ``per_author_skill_ci`` (95% intervals) and ``sample`` metadata
+    including the achieved ``fraction``.
+    """
+    if not 0 < rate <= 1:
+        raise ValueError("Sample rate must be in (0, 1].")
+    root = _find_git_root(repo_path)
+    if root is None:
+        raise RuntimeError(f"Path '{repo_path}' is not inside a Git repository.")
+    now = now or dt.datetime.now(dt.timezone.utc)
+
+    strata = _commit_strata(root, cfg, math.ceil(min_per_stratum / rate))
+    picked = _sample_strata(strata, rate, min_per_stratum, seed)
+    weights = {
+        h: len(strata[key]) / len(hashes)
+        for key, hashes in picked.items()
+        for h in hashes
+    }
+
+    records: Dict[str, CommitRecord] = {}
+    if weights:
+        skills_cache: Dict[str, List[str]] = {}
+        content = _content_classifier(root, cfg)
+        try:
+            repo = Repository(path_to_repo=root, only_commits=list(weights))
+            for commit in repo.traverse_commits():
+                record = _commit_record(commit, cfg, skills_cache, content)
+                if record is not None:
+                    records[record.hash] = record
+        finally:
+            if content is not None:
+                content.close()
+
+    result = aggregate_commits(list(records.values()), cfg, now, weights=weights)
+    result["repo"] = os.path.abspath(root)
+    result["per_author_skill_ci"] = _intervals(strata, picked, records, cfg, now)
+    total = sum(len(v) for v in strata.values())
+    result["sample"] = {
+        "rate": rate,
+        "seed": seed,
+        "strata": len(strata),
+        "commits_total": total,
+        "commits_sampled": len(weights),
+        "fraction": len(weights) / total if total else 0.0,
+    }
+    return result
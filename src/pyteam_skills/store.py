@@ -0,0 +1,123 @@
+"""Date-partitioned contribution store for time-window queries without rescans.
+
+Commits from a scan are kept in one JSON partition per UTC month, each sorted
+by commit timestamp. A query only opens the partitions that overlap the window
+and bisects the edge partitions, then re-scores the selected commits.
+"""
+
+from __future__ import annotations
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import datetime as dt
+import json
+import os
+
+from .config import Config
+from .repo_scan import aggregate_commits, commit_from_dict
+from .utils import month_bucket
+
+STORE_VERSION = 1
+MANIFEST = "manifest.json"
+
+
+def _to_utc(value: dt.datetime) -> dt.datetime:
+    """Return *value* as an aware UTC datetime (naive values are taken as UTC)."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=dt.timezone.utc)
+    return value.astimezone(dt.timezone.utc)
+
+
+def _parse_bound(value: Optional[str]) -> Optional[dt.datetime]:
+    """Parse an ISO date/datetime window bound."""
+    return _to_utc(dt.datetime.fromisoformat(value)) if value else None
+
+
+def _load_partition(path: Path) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _load_manifest(store_dir: str) -> Dict[str, Any]:
+    path = Path(store_dir) / MANIFEST
+    if not path.exists():
+        return {"version": STORE_VERSION, "repo": None, "partitions": []}
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("version") != STORE_VERSION:
+        raise RuntimeError(f"Unsupported store version in '{store_dir}'.")
+    return manifest
+
+
+def write_store(scan: Dict[str, Any], store_dir: str) -> int:
+    """Merge the commits of *scan* into the store; return the commit count added.
+
+    Incoming commits replace stored ones with the same hash, so overlapping
+    or incremental scans can be appended safely and a rescan after a config
+    change (aliases, ignore rules, skills) refreshes the stored commits.
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    manifest = _load_manifest(store_dir)
+
+    by_month: Dict[str, List[Dict[str, Any]]] = {}
+    for c in scan.get("commits", []):
+        month = month_bucket(_to_utc(dt.datetime.fromisoformat(c["date"])))
+        by_month.setdefault(month, []).append(c)
+
+    added = 0
+    for month, new in by_month.items():
+        path = Path(store_dir) / f"{month}.json"
+        stored = _load_partition(path)["commits"] if path.exists() else []
+        by_hash = {c["hash"]: c for c in stored}
+        for c in new:
+            if c["hash"] not in by_hash:
+                added += 1
+            by_hash[c["hash"]] = c
+        commits = list(by_hash.values())
+        keyed = sorted(
+            (
+                (_to_utc(dt.datetime.fromisoformat(c["date"])).timestamp(), c)
+                for c in commits
+            ),
+            key=lambda kv: kv[0],
+        )
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"ts": [k for k, _ in keyed], "commits": [c for _, c in keyed]}, f
+            )
+
+    manifest["partitions"] = sorted(set(manifest["partitions"]) | set(by_month))
+    manifest["repo"] = scan.get("repo") or manifest.get("repo")
+    with open(Path(store_dir) / MANIFEST, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return added
+
+
+def query_store(
+    store_dir: str,
+    cfg: Config,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    now: Optional[dt.datetime] = None,
+) -> Dict[str, Any]:
+    """Return a scan dict for commits dated in ``[since, until)`` from the store."""
+    manifest = _load_manifest(store_dir)
+    lo = _parse_bound(since)
+    hi = _parse_bound(until)
+    lo_month = month_bucket(lo) if lo else None
+    hi_month = month_bucket(hi) if hi else None
+
+    selected: List[Dict[str, Any]] = []
+    for month in manifest["partitions"]:
+        if (lo_month and month < lo_month) or (hi_month and month > hi_month):
+            continue
+        part = _load_partition(Path(store_dir) / f"{month}.json")
+        ts = part["ts"]
+        start = bisect_left(ts, lo.timestamp()) if lo else 0
+        end = bisect_left(ts, hi.timestamp()) if hi else len(ts)
+        selected.extend(part["commits"][start:end])
+
+    result = aggregate_commits([commit_from_dict(c) for c in selected], cfg, now)
+    result["repo"] = manifest.get("repo")
+    result["window"] = {"since": since, "until": until}
+    return result
@@ -49,13 +49,22 @@ def file_skills(
     ext_map: Dict[str, List[str]],
     path_map: Dict[str, List[str]],
     regex_map: Dict[str, List[str]],
+    content_skills: Optional[List[str]] = None,
 ) -> List[str]:
-    """Determine skills for a file path with precedence."""
+    """Determine skills for a file path with precedence.
+
+    ``content_skills`` are skills already matched from the file's content
+    (see ``content.ContentClassifier``); they rank right after path regexes.
+    """
     # 1) regex overrides (first match wins)
     for pattern, skills in (regex_map or {}).items():
         if re.match(pattern, path):
             return skills
 
+    # 1b) content rules (import/regex signatures in the blob)
+    if content_skills:
+        return content_skills
+
     # 2) path prefix overrides (longest prefix wins)
     matched: Optional[List[str]] = None
     best_len = -1
@@ -78,3 +87,34 @@ def file_skills(
 def month_bucket(d: dt.datetime) -> str:
     """Return YYYY-MM string for a datetime."""
     return d.strftime("%Y-%m")
+
+
+def day_bucket(d: dt.datetime) -> str:
+    """Return YYYY-MM-DD string for a datetime."""
+    return d.strftime("%Y-%m-%d")
+
+
+def week_bucket(d: dt.datetime) -> str:
+    """Return ISO week string (YYYY-Www) for a datetime."""
+    year, week, _ = d.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def quarter_bucket(d: dt.datetime) -> str:
+    """Return YYYY-Qn string for a datetime."""
+    return f"{d.year}-Q{(d.month - 1) // 3 + 1}"
+
+
+def year_bucket(d: dt.datetime) -> str:
+    """Return YYYY string for a datetime."""
+    return d.strftime("%Y")
+
+
+# Granularity name -> bucket function, for trend rollups
+BUCKETS = {
+    "day": day_bucket,
+    "week": week_bucket,
+    "month": month_bucket,
+    "quarter": quarter_bucket,
+    "year": year_bucket,
+}
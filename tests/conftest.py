@@ -1,6 +1,51 @@
+import os
+import subprocess
 import sys
 import pathlib
 
+import pytest
+
 ROOT = pathlib.Path(__file__).resolve().parents[1]
 SRC = ROOT / "src"
 sys.path.insert(0, str(SRC))
+
+
+def _git(cwd, *args, env=None):
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, env=env)
+
+
+def commit_file(repo, path, content, author, date):
+    """Write *content* to *path* and commit it as *author* ("Name <email>")."""
+    name, email = author[:-1].split(" <")
+    full = repo / path
+    full.parent.mkdir(parents=True, exist_ok=True)
+    full.write_text(content)
+    env = dict(
+        os.environ,
+        GIT_AUTHOR_NAME=name,
+        GIT_AUTHOR_EMAIL=email,
+        GIT_AUTHOR_DATE=date,
+        GIT_COMMITTER_NAME=name,
+        GIT_COMMITTER_EMAIL=email,
+        GIT_COMMITTER_DATE=date,
+    )
+    _git(repo, "add", path, env=env)
+    _git(repo, "commit", "-q", "-m", f"edit {path}", env=env)
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    """A small repository with two authors touching Python and SQL files."""
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _git(repo, "init", "-q", "-b", "main")
+    commit_file(
+        repo, "app.py", "a\nb\nc\n", "Alice <alice@x>", "2024-01-10T12:00:00+00:00"
+    )
+    commit_file(
+        repo, "db/schema.sql", "x\ny\n", "Bob <bob@x>", "2024-02-10T12:00:00+00:00"
+    )
+    commit_file(
+        repo, "app.py", "a\nb\nc\nd\n", "Bob <bob@x>", "2024-03-10T12:00:00+00:00"
+    )
+    return repo
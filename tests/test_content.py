@@ -0,0 +1,97 @@
+import pytest
+
+from conftest import commit_file
+
+from pyteam_skills.config import Config
+from pyteam_skills.content import ContentClassifier
+from pyteam_skills.ownership import blame_ownership
+from pyteam_skills.repo_scan import rescan, scan_repo
+from pyteam_skills.utils import file_skills
+
+
+def _cfg():
+    return Config(
+        extension_skills={".py": ["Python"], ".sql": ["SQL"]},
+        content_skills={"^(from|import) django": ["Django"]},
+    )
+
+
+def test_classifier_reads_each_blob_once(git_repo):
+    with ContentClassifier(str(git_repo), {"^d$": ["D"], "^a$": ["A"]}) as content:
+        sha = content.blob_sha("HEAD", "app.py")
+        assert content.blob_sha("HEAD", "missing.py") is None
+        assert content.skills(sha) == ["D"]  # first matching rule wins
+        assert content.skills(content.blob_sha("HEAD", "db/schema.sql")) is None
+        batch, content._batch = content._batch, None
+        assert content.skills(sha) == ["D"]  # cached: no second read
+        content._batch = batch
+
+
+def test_content_rules_rank_between_regex_and_path():
+    assert file_skills("a.py", {".py": ["Python"]}, {}, {}, ["Django"]) == ["Django"]
+    assert file_skills("a.py", {}, {}, {r".*\.py$": ["X"]}, ["Django"]) == ["X"]
+
+
+def test_scan_rescan_and_blame_use_content_rules(git_repo, tmp_path):
+    commit_file(
+        git_repo,
+        "web/views.py",
+        "from django.http import HttpResponse\n",
+        "Alice <alice@x>",
+        "2024-04-10T12:00:00+00:00",
+    )
+    cache = str(tmp_path / "raw.json")
+    scan = scan_repo(str(git_repo), _cfg(), raw_cache=cache)
+    alice = scan["per_author_skill"]["Alice <alice@x>"]
+    assert set(alice) == {"Python", "Django"}
+
+    assert set(rescan(cache, _cfg())["per_author_skill"]["Alice <alice@x>"]) == {
+        "Python",
+        "Django",
+    }
+    owned = blame_ownership(str(git_repo), _cfg())
+    assert owned["per_author_skill"]["Alice <alice@x>"] == {
+        "Python": 3.0,
+        "Django": 1.0,
+    }
+
+
+def test_rescan_applies_content_rules_added_later(git_repo, tmp_path):
+    commit_file(
+        git_repo,
+        "web/views.py",
+        "import django\n",
+        "Alice <alice@x>",
+        "2024-04-10T12:00:00+00:00",
+    )
+    cache = str(tmp_path / "raw.json")
+    plain = Config(extension_skills={".py": ["Python"], ".sql": ["SQL"]})
+    scan = scan_repo(str(git_repo), plain, raw_cache=cache)
+    assert set(scan["per_author_skill"]["Alice <alice@x>"]) == {"Python"}
+    redone = rescan(cache, _cfg())
+    assert set(redone["per_author_skill"]["Alice <alice@x>"]) == {"Python", "Django"}
+
+
+def test_large_blobs_are_truncated_without_desyncing(git_repo, monkeypatch):
+    import pyteam_skills.content as content_mod
+
+    monkeypatch.setattr(content_mod, "MAX_BYTES", 4)
+    monkeypatch.setattr(content_mod, "CHUNK", 3)
+    commit_file(
+        git_repo,
+        "big.txt",
+        "x\n" * 20 + "d\n",
+        "Alice <alice@x>",
+        "2024-04-10T12:00:00+00:00",
+    )
+    with ContentClassifier(str(git_repo), {"^d$": ["D"], "^a$": ["A"]}) as content:
+        assert content.skills(content.blob_sha("HEAD", "big.txt")) is None
+        assert content.skills(content.blob_sha("HEAD", "app.py")) == ["A"]
+
+
+def test_rescan_with_content_rules_needs_the_cached_repo(git_repo, tmp_path):
+    cache = str(tmp_path / "raw.json")
+    scan_repo(str(git_repo), Config(), raw_cache=cache)
+    git_repo.rename(tmp_path / "moved")
+    with pytest.raises(RuntimeError, match="content_skills"):
+        rescan(cache, _cfg())
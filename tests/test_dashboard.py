@@ -1,6 +1,8 @@
+import json
 import os
 
-from pyteam_skills.dashboard import generate_dashboard
+from pyteam_skills.dashboard import generate_dashboard, generate_team_dashboards
+from pyteam_skills.pathtree import new_node, tree_add
 
 
 def test_generate_dashboard_writes_files(tmp_path):
@@ -19,3 +21,65 @@ def test_generate_dashboard_writes_files(tmp_path):
     with open(paths["index_html"], "r", encoding="utf-8") as f:
         page = f.read()
     assert '<script id="data-script" type="application/json">' in page
+
+
+def test_generate_dashboard_sparse_coo(tmp_path):
+    scan = {
+        "per_author_skill": {"A <a@x>": {"Python": 2.0}, "B <b@x>": {"SQL": 1.0}},
+        "trend_monthly": {},
+        "raw_rows": [],
+    }
+    paths = generate_dashboard(scan, str(tmp_path), sparse=True)
+    with open(paths["data_json"], "r", encoding="utf-8") as f:
+        data = json.load(f)
+    norm = data["matrix_norm"]
+    assert norm["format"] == "coo"
+    assert sorted(zip(norm["row"], norm["col"], norm["values"])) == [
+        (0, 0, 100.0),
+        (1, 1, 100.0),
+    ]
+
+
+def test_team_dashboards_slice_one_shared_computation(tmp_path):
+    scan = {
+        "per_author_skill": {
+            "A <a@core>": {"Python": 4.0},
+            "B <b@web>": {"Python": 2.0, "React": 3.0},
+            "C <c@other>": {"SQL": 1.0},
+        },
+        "trend_monthly": {
+            "2024-01": {"A <a@core>": {"Python": 4.0}, "B <b@web>": {"React": 3.0}}
+        },
+        "raw_rows": [],
+        "path_tree": new_node(),
+    }
+    for author, score in [("A <a@core>", 9.0), ("C <c@other>", 5.0)]:
+        tree_add(scan["path_tree"], "svc/api/a.py", author, score)
+    for author in ("D <d@x>", "E <e@x>"):
+        tree_add(scan["path_tree"], "svc/api/b.py", author, 3.0)
+    tree_add(scan["path_tree"], "svc/api/c.py", "B <b@web>", 1.0)
+    teams = {"Core": ["@core"], "Web Team": ["@web"], "Empty": ["nobody"]}
+    for sparse in (False, True):
+        out = tmp_path / f"teams-{sparse}"
+        paths = generate_team_dashboards(
+            scan, str(out), teams, sparse=sparse, workers=2
+        )
+        assert set(paths) == {"index_html", "Core", "Web Team"}
+        with open(out / "web-team" / "data.json", encoding="utf-8") as f:
+            web = json.load(f)
+        assert web["meta"]["team"] == "Web Team"
+        assert web["matrix_norm"]["index"] == ["B <b@web>"]
+        assert web["matrix_norm"]["columns"] == ["Python", "React"]
+        assert [r["author"] for r in web["trends"]] == ["B <b@web>"]
+        # B is only 5th in svc/ org-wide but still owns it within the team
+        dirs = {d["path"]: d for d in web["directories"]}
+        assert dirs["svc/"]["top_authors"] == [["B <b@web>", 1.0]]
+        assert dirs["svc/"]["bus_factor"] == 1
+        with open(paths["index_html"], encoding="utf-8") as f:
+            page = f.read()
+        assert 'href="core/index.html"' in page and "1 author(s) without a team" in page
+
+    with open(out / "web-team" / "data.json", encoding="utf-8") as f:
+        norm = json.load(f)["matrix_norm"]
+    # normalized against the whole org: A is the top Python author
+    assert sorted(zip(norm["col"], norm["values"])) == [(0, 50.0), (1, 100.0)]
@@ -0,0 +1,94 @@
+import datetime as dt
+import sqlite3
+
+import pytest
+
+from pyteam_skills.config import Config
+from pyteam_skills.db import load_scan_db, write_scan_db
+from pyteam_skills.repo_scan import scan_repo
+
+
+def test_db_roundtrip_and_window(git_repo, tmp_path):
+    cfg = Config(extension_skills={".py": ["Python"], ".sql": ["SQL"]})
+    scan = scan_repo(str(git_repo), cfg)
+    db = str(tmp_path / "scan.sqlite")
+    write_scan_db(scan, db)
+    write_scan_db(scan, db)  # re-append is idempotent
+
+    loaded = load_scan_db(db)
+    assert loaded["per_author_skill"].keys() == scan["per_author_skill"].keys()
+    for author, by_skill in scan["per_author_skill"].items():
+        for skill, score in by_skill.items():
+            assert abs(loaded["per_author_skill"][author][skill] - score) < 1e-9
+    assert loaded["trend_monthly"].keys() == scan["trend_monthly"].keys()
+    assert len(loaded["raw_rows"]) == len(scan["raw_rows"])
+
+    window = load_scan_db(db, since="2024-02-01", until="2024-03-01")
+    assert window["per_author_skill"].keys() == {"Bob <bob@x>"}
+    assert list(window["trend_monthly"]) == ["2024-02"]
+
+    with sqlite3.connect(db) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_rescan_replaces_decayed_scores_and_aliases(git_repo, tmp_path):
+    cfg = Config(
+        extension_skills={".py": ["Python"], ".sql": ["SQL"]}, decay_half_life_days=30
+    )
+    db = str(tmp_path / "scan.sqlite")
+    early = dt.datetime(2024, 4, 1, tzinfo=dt.timezone.utc)
+    write_scan_db(scan_repo(str(git_repo), cfg, now=early), db)
+
+    cfg.author_aliases = {"Bob <bob@x>": "Robert <bob@x>"}
+    late = scan_repo(str(git_repo), cfg, now=early + dt.timedelta(days=365))
+    write_scan_db(late, db)
+
+    loaded = load_scan_db(db)["per_author_skill"]
+    assert loaded.keys() == late["per_author_skill"].keys()
+    for author, by_skill in late["per_author_skill"].items():
+        for skill, score in by_skill.items():
+            assert abs(loaded[author][skill] - score) < 1e-9
+
+
+def test_each_batch_leaves_rows_and_totals_consistent(git_repo, tmp_path, monkeypatch):
+    import pyteam_skills.db as dbmod
+
+    cfg = Config(extension_skills={".py": ["Python"], ".sql": ["SQL"]})
+    db = str(tmp_path / "scan.sqlite")
+    write_scan_db(scan_repo(str(git_repo), cfg), db)
+
+    real, calls = dbmod._replace_commits, []
+
+    def fail_second(conn, hashes, grouped):
+        calls.append(hashes)
+        real(conn, hashes, grouped)
+        if len(calls) == 2:
+            raise RuntimeError("interrupted")
+
+    monkeypatch.setattr(dbmod, "_replace_commits", fail_second)
+    cfg.extension_skills[".py"] = ["Backend"]
+    with pytest.raises(RuntimeError):
+        write_scan_db(scan_repo(str(git_repo), cfg), db, batch_size=1)
+
+    with sqlite3.connect(db) as conn:
+        totals = dict(
+            ((a, s), v)
+            for a, s, v in conn.execute(
+                "SELECT author, skill, SUM(score) FROM contributions "
+                "GROUP BY author, skill"
+            )
+        )
+        stored = {(a, s): v for a, s, v in conn.execute("SELECT * FROM skill_scores")}
+        per_commit = dict(
+            conn.execute(
+                "SELECT commit_hash, COUNT(*) FROM contributions GROUP BY commit_hash"
+            )
+        )
+    assert stored == totals
+    # only the first batch landed, and its commit was replaced as a whole
+    assert len(per_commit) == 3
+    assert ("Alice <alice@x>", "Backend") in stored or (
+        "Bob <bob@x>",
+        "Backend",
+    ) in stored
+    assert any(skill == "Python" for _, skill in stored)
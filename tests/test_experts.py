@@ -0,0 +1,80 @@
+import pytest
+
+from pyteam_skills.experts import ExpertIndex
+
+
+def _scan():
+    return {
+        "per_author_skill": {
+            "Alice <a@x>": {"Terraform": 10.0, "Python": 1.0},
+            "Bob <b@x>": {"Terraform": 4.0},
+            "Cara <c@x>": {"Terraform": 7.0},
+        },
+        "trend_monthly": {
+            "2023-06": {"Alice <a@x>": {"Terraform": 10.0}},
+            "2024-02": {
+                "Bob <b@x>": {"Terraform": 4.0},
+                "Cara <c@x>": {"Terraform": 7.0},
+            },
+        },
+        "raw_rows": [
+            {
+                "commit": "1",
+                "author": "Alice <a@x>",
+                "path": "infra/main.tf",
+                "skill": "Terraform",
+                "score": 10.0,
+            },
+            {
+                "commit": "2",
+                "author": "Bob <b@x>",
+                "path": "services/billing/api.py",
+                "skill": "Python",
+                "score": 3.0,
+            },
+            {
+                "commit": "2",
+                "author": "Bob <b@x>",
+                "path": "services/billing/api.py",
+                "skill": "Backend",
+                "score": 3.0,
+            },
+            {
+                "commit": "3",
+                "author": "Cara <c@x>",
+                "path": "services/billing/db.sql",
+                "skill": "SQL",
+                "score": 5.0,
+            },
+        ],
+    }
+
+
+def test_expert_queries(tmp_path):
+    idx = ExpertIndex.from_scan(_scan())
+    assert [a for a, _ in idx.top_for_skill("Terraform", 2)] == [
+        "Alice <a@x>",
+        "Cara <c@x>",
+    ]
+    assert [a for a, _ in idx.top_for_skill("Terraform", 5, since="2024-01")] == [
+        "Cara <c@x>",
+        "Bob <b@x>",
+    ]
+    # ISO dates are cut to their month; bare years are rejected
+    assert idx.top_for_skill("Terraform", 5, since="2024-02-01") == idx.top_for_skill(
+        "Terraform", 5, since="2024-02"
+    )
+    assert idx.top_for_skill("Terraform", 5, until="2023-06-30") == [
+        ("Alice <a@x>", 10.0)
+    ]
+    with pytest.raises(ValueError):
+        idx.top_for_skill("Terraform", 5, until="2024")
+    assert idx.top_for_author("Alice <a@x>", 1) == [("Terraform", 10.0)]
+    assert idx.top_for_path("services/billing/") == [
+        ("Cara <c@x>", 5.0),
+        ("Bob <b@x>", 3.0),
+    ]
+
+    p = tmp_path / "idx.json"
+    idx.save(str(p))
+    assert ExpertIndex.from_file(str(p)) == idx
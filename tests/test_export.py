@@ -0,0 +1,54 @@
+import gzip
+
+import pandas as pd
+import pytest
+
+from pyteam_skills.matrix import export_csvs
+
+
+def _scan():
+    return {
+        "per_author_skill": {"A <a@x>": {"Python": 2.0}, "B <b@x>": {"SQL": 1.0}},
+        "trend_monthly": {"2024-01": {"A <a@x>": {"Python": 2.0}}},
+        "raw_rows": [
+            {
+                "commit": str(i),
+                "author": "A <a@x>",
+                "date": "2024-01-01T00:00:00+00:00",
+                "path": "a.py",
+                "skill": "Python",
+                "lines_added": i,
+                "lines_deleted": 0,
+                "score": float(i),
+            }
+            for i in range(25)
+        ],
+    }
+
+
+def test_export_gzip_streams_all_rows(tmp_path):
+    paths = export_csvs(_scan(), str(tmp_path), compress="gzip", chunk_size=10)
+    assert paths["raw_contributions"].endswith("raw_contributions.csv.gz")
+    with gzip.open(paths["raw_contributions"], "rt") as f:
+        raw = pd.read_csv(f)
+    assert len(raw) == 25 and raw["score"].sum() == sum(range(25))
+    mat = pd.read_csv(paths["skill_matrix"], index_col=0)
+    assert mat.loc["A <a@x>", "Python"] == 2.0
+
+
+def test_raw_csv_bytes_match_pandas(tmp_path):
+    scan = _scan()
+    scan["raw_rows"][3]["score"] = 0.1 + 0.2
+    scan["raw_rows"][4]["path"] = 'dir, with "quotes"/a.py'
+    paths = export_csvs(scan, str(tmp_path), chunk_size=10)
+    expected = tmp_path / "expected.csv"
+    pd.DataFrame(scan["raw_rows"]).to_csv(expected, index=False)
+    with open(paths["raw_contributions"], "rb") as f:
+        assert f.read() == expected.read_bytes()
+
+
+def test_export_parquet(tmp_path):
+    pytest.importorskip("pyarrow")
+    paths = export_csvs(_scan(), str(tmp_path), fmt="parquet", chunk_size=10)
+    assert len(pd.read_parquet(paths["raw_contributions"])) == 25
+    assert list(pd.read_parquet(paths["skill_trends"])["month"]) == ["2024-01"]
@@ -1,4 +1,11 @@
-from pyteam_skills.matrix import build_skill_matrix, _normalize_matrix, build_trends
+import pandas as pd
+
+from pyteam_skills.matrix import (
+    build_skill_matrix,
+    _normalize_matrix,
+    build_trends,
+    to_long,
+)
 
 
 def _fake_scan():
@@ -34,3 +41,16 @@ def test_build_trends():
     # normalized per (month, skill)
     top = tr[(tr["month"] == "2024-01") & (tr["skill"] == "Python")]
     assert set(top["norm"].unique()) == {100.0, 50.0}
+
+
+def test_sparse_matrix_matches_dense():
+    scan = _fake_scan()
+    dense = _normalize_matrix(build_skill_matrix(scan))
+    sparse = _normalize_matrix(build_skill_matrix(scan, sparse=True))
+    assert all(isinstance(t, pd.SparseDtype) for t in sparse.dtypes)
+    assert sparse.sparse.to_dense().equals(dense)
+
+    long = to_long(build_skill_matrix(scan, sparse=True), sparse)
+    assert len(long) == 3
+    bob = long[long["author"] == "Bob <bob@x>"].iloc[0]
+    assert (bob["skill"], bob["score"], bob["norm"]) == ("Python", 5.0, 50.0)
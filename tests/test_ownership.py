@@ -0,0 +1,54 @@
+from conftest import commit_file
+
+from pyteam_skills.config import Config
+from pyteam_skills.ownership import blame_ownership, load_blame_cache
+
+
+def _cfg():
+    return Config(extension_skills={".py": ["Python"], ".sql": ["SQL"]})
+
+
+def test_blame_ownership_counts_surviving_lines(git_repo):
+    scan = blame_ownership(str(git_repo), _cfg())
+    assert scan["per_author_skill"] == {
+        "Alice <alice@x>": {"Python": 3.0},
+        "Bob <bob@x>": {"Python": 1.0, "SQL": 2.0},
+    }
+    assert scan["trend_monthly"]["2024-02"] == {"Bob <bob@x>": {"SQL": 2.0}}
+
+
+def test_blame_cache_is_keyed_by_path_and_blob(git_repo, tmp_path, monkeypatch):
+    cache = tmp_path / "blame.json"
+    blame_ownership(str(git_repo), _cfg(), cache_path=str(cache))
+    assert len(load_blame_cache(str(cache))) == 2
+
+    import pyteam_skills.ownership as own
+
+    def _fail(*args):
+        raise AssertionError("cached blob was blamed again")
+
+    monkeypatch.setattr(own, "_blame_file", _fail)
+    again = blame_ownership(str(git_repo), _cfg(), cache_path=str(cache))
+    assert again["per_author_skill"]["Bob <bob@x>"]["SQL"] == 2.0
+    monkeypatch.undo()
+
+    # entries for replaced blobs are dropped on save
+    commit_file(
+        git_repo, "app.py", "z\n", "Alice <alice@x>", "2024-04-10T12:00:00+00:00"
+    )
+    blame_ownership(str(git_repo), _cfg(), cache_path=str(cache))
+    keys = load_blame_cache(str(cache))
+    assert len(keys) == 2
+    assert sorted(k.split("\0")[0] for k in keys) == ["app.py", "db/schema.sql"]
+
+
+def test_identical_files_keep_their_own_authors(git_repo):
+    commit_file(
+        git_repo, "a.py", "x\ny\n", "Alice <alice@x>", "2024-04-10T12:00:00+00:00"
+    )
+    commit_file(
+        git_repo, "b.py", "x\ny\n", "Carol <carol@x>", "2024-05-10T12:00:00+00:00"
+    )
+    scan = blame_ownership(str(git_repo), _cfg())
+    assert scan["per_author_skill"]["Alice <alice@x>"] == {"Python": 5.0}
+    assert scan["per_author_skill"]["Carol <carol@x>"] == {"Python": 2.0}
@@ -0,0 +1,41 @@
+from pyteam_skills.config import Config
+from pyteam_skills.pathtree import (
+    bus_factor,
+    export_directories,
+    find_node,
+    new_node,
+    top_authors,
+    tree_add,
+)
+from pyteam_skills.repo_scan import scan_repo
+
+
+def test_tree_rolls_up_and_answers_queries():
+    root = new_node()
+    tree_add(root, "services/billing/api.py", "A", 6.0)
+    tree_add(root, "services/billing/db/models.py", "B", 3.0)
+    tree_add(root, "services/auth/login.py", "B", 5.0)
+    tree_add(root, "README.md", "C", 1.0)
+
+    billing = find_node(root, "services/billing/")
+    assert billing["scores"] == {"A": 6.0, "B": 3.0}
+    assert top_authors(find_node(root, "services")["scores"], 1) == [("B", 8.0)]
+    assert bus_factor(billing["scores"]) == 1
+    assert bus_factor({"A": 1.0, "B": 1.0, "C": 1.0}) == 2
+    assert find_node(root, "nope/") is None
+
+    dirs = {d["path"]: d for d in export_directories(root)}
+    assert set(dirs) == {
+        "services/",
+        "services/auth/",
+        "services/billing/",
+        "services/billing/db/",
+    }
+    assert dirs["services/"]["authors"] == 2
+
+
+def test_scan_builds_path_tree(git_repo):
+    scan = scan_repo(str(git_repo), Config())
+    tree = scan["path_tree"]
+    assert set(find_node(tree, "db/")["scores"]) == {"Bob <bob@x>"}
+    assert set(tree["scores"]) == {"Alice <alice@x>", "Bob <bob@x>"}
@@ -0,0 +1,53 @@
+import subprocess
+
+from pyteam_skills.config import Config
+from pyteam_skills.ownership import blame_ownership
+from pyteam_skills.repo_scan import _find_git_root, rescan, scan_repo
+
+
+def _cfg():
+    return Config(extension_skills={".py": ["Python"], ".sql": ["SQL"]})
+
+
+def test_scan_repo_aggregates_per_author(git_repo):
+    scan = scan_repo(str(git_repo), _cfg())
+    assert set(scan["per_author_skill"]) == {"Alice <alice@x>", "Bob <bob@x>"}
+    assert set(scan["trend_monthly"]) == {"2024-01", "2024-02", "2024-03"}
+    assert len(scan["commits"]) == 3
+
+
+def test_scan_bare_mirror_without_worktree(git_repo, tmp_path):
+    mirror = tmp_path / "mirror.git"
+    subprocess.run(
+        ["git", "clone", "-q", "--mirror", str(git_repo), str(mirror)], check=True
+    )
+    assert _find_git_root(str(mirror)) == str(mirror)
+    bare = scan_repo(str(mirror), _cfg())
+    full = scan_repo(str(git_repo), _cfg())
+    assert bare["per_author_skill"].keys() == full["per_author_skill"].keys()
+    assert len(bare["commits"]) == 3
+    owned = blame_ownership(str(mirror), _cfg())
+    assert owned["per_author_skill"]["Alice <alice@x>"] == {"Python": 3.0}
+
+
+def test_rescan_reclassifies_cached_stats_without_git(git_repo, tmp_path, monkeypatch):
+    cache = str(tmp_path / "raw.json")
+    scan = scan_repo(str(git_repo), _cfg(), raw_cache=cache)
+
+    import pyteam_skills.repo_scan as rs
+
+    monkeypatch.setattr(rs, "Repository", None)  # rescan must not touch git
+    same = rescan(cache, _cfg())
+    assert same["per_author_skill"].keys() == scan["per_author_skill"].keys()
+
+    new_cfg = Config(
+        path_skills={"db/": ["Data Modeling"]},
+        extension_skills={".py": ["Backend"]},
+        ignore_authors=["alice@"],
+    )
+    redone = rescan(cache, new_cfg)
+    assert set(redone["per_author_skill"]) == {"Bob <bob@x>"}
+    assert set(redone["per_author_skill"]["Bob <bob@x>"]) == {
+        "Backend",
+        "Data Modeling",
+    }
@@ -0,0 +1,46 @@
+import datetime as dt
+
+from pyteam_skills.config import Config
+from pyteam_skills.matrix import build_trends
+from pyteam_skills.repo_scan import scan_repo
+from pyteam_skills.rollups import rollup, trends_for
+from pyteam_skills.utils import quarter_bucket, week_bucket
+
+
+def _daily():
+    return {
+        "2024-01-02": {"A": {"Python": 1.0}},
+        "2024-01-30": {"A": {"Python": 2.0}, "B": {"Python": 4.0}},
+        "2024-02-01": {"A": {"SQL": 3.0}},
+        "2024-04-15": {"B": {"Python": 5.0}},
+    }
+
+
+def test_bucket_helpers():
+    d = dt.datetime(2024, 12, 30)
+    assert week_bucket(d) == "2025-W01"
+    assert quarter_bucket(d) == "2024-Q4"
+
+
+def test_rollup_granularities():
+    assert rollup(_daily(), "quarter") == {
+        "2024-Q1": {"A": {"Python": 3.0, "SQL": 3.0}, "B": {"Python": 4.0}},
+        "2024-Q2": {"B": {"Python": 5.0}},
+    }
+    weeks = rollup(_daily(), "week")
+    assert list(weeks) == ["2024-W01", "2024-W05", "2024-W16"]
+    assert weeks["2024-W05"]["A"] == {"Python": 2.0, "SQL": 3.0}
+
+
+def test_build_trends_by_granularity_from_scan(git_repo):
+    scan = scan_repo(str(git_repo), Config(extension_skills={".py": ["Python"]}))
+    monthly = rollup(scan["trend_daily"], "month")
+    for month, by_author in scan["trend_monthly"].items():
+        for author, by_skill in by_author.items():
+            for skill, score in by_skill.items():
+                assert abs(monthly[month][author][skill] - score) < 1e-9
+
+    yearly = build_trends(scan, "year")
+    assert set(yearly["year"]) == {"2024"}
+    assert yearly.groupby("skill")["norm"].max().eq(100.0).all()
+    assert trends_for(scan, "year") is scan["trend_rollups"]["year"]
@@ -0,0 +1,64 @@
+import datetime as dt
+
+from conftest import commit_file
+
+from pyteam_skills.config import Config
+from pyteam_skills.repo_scan import scan_repo
+from pyteam_skills.sampling import sample_scan
+
+NOW = dt.datetime(2024, 6, 1, tzinfo=dt.timezone.utc)
+
+
+def _cfg():
+    return Config(extension_skills={".py": ["Python"], ".sql": ["SQL"]})
+
+
+def test_full_rate_matches_exact_scan(git_repo):
+    exact = scan_repo(str(git_repo), _cfg(), now=NOW)
+    approx = sample_scan(str(git_repo), _cfg(), rate=1.0, now=NOW)
+    assert approx["sample"]["commits_sampled"] == 3
+    for author, by_skill in exact["per_author_skill"].items():
+        for skill, score in by_skill.items():
+            assert abs(approx["per_author_skill"][author][skill] - score) < 1e-9
+            low, high = approx["per_author_skill_ci"][author][skill]
+            assert abs(low - score) < 1e-9 and abs(high - score) < 1e-9
+
+
+def test_sample_scales_up_with_interval(git_repo):
+    for i in range(8):
+        commit_file(
+            git_repo,
+            "app.py",
+            "x\n" * (i + 2),
+            "Alice <alice@x>",
+            f"2024-04-{i + 1:02d}T12:00:00+00:00",
+        )
+    exact = scan_repo(str(git_repo), _cfg(), now=NOW)
+    approx = sample_scan(str(git_repo), _cfg(), rate=0.5, seed=1, now=NOW)
+    assert approx["sample"]["commits_total"] == 11
+    # Bob's two commits form one stratum; Alice's Jan + Apr commits another
+    assert approx["sample"]["strata"] == 2
+    assert approx["sample"]["commits_sampled"] == 5
+    est = approx["per_author_skill"]["Alice <alice@x>"]["Python"]
+    low, high = approx["per_author_skill_ci"]["Alice <alice@x>"]["Python"]
+    assert low <= est <= high
+    assert low > 0
+    assert exact["per_author_skill"]["Alice <alice@x>"]["Python"] > 0
+
+
+def test_light_committers_are_pooled(git_repo):
+    for i in range(30):
+        commit_file(
+            git_repo,
+            f"f{i}.py",
+            "x\n",
+            f"Dev{i} <dev{i}@x>",
+            f"2024-{4 + i % 2:02d}-{i // 2 + 1:02d}T12:00:00+00:00",
+        )
+    approx = sample_scan(str(git_repo), _cfg(), rate=0.1, seed=3, now=NOW)
+    info = approx["sample"]
+    assert info["commits_total"] == 33
+    # two pooled strata (Jan..Apr: 18 commits, May: 15), not one per author
+    assert info["strata"] == 2
+    assert info["commits_sampled"] == 4
+    assert info["fraction"] == 4 / 33
@@ -0,0 +1,27 @@
+from pyteam_skills.config import Config
+from pyteam_skills.repo_scan import scan_repo
+from pyteam_skills.store import query_store, write_store
+
+
+def test_store_window_query_matches_filtered_scan(git_repo, tmp_path):
+    cfg = Config(extension_skills={".py": ["Python"], ".sql": ["SQL"]})
+    store = str(tmp_path / "store")
+    assert write_store(scan_repo(str(git_repo), cfg), store) == 3
+    # re-merging after a config change replaces the stored commits
+    new_cfg = Config(
+        extension_skills={".py": ["Backend"], ".sql": ["SQL"]},
+        author_aliases={"Alice <alice@x>": "Alicia <alice@x>"},
+    )
+    assert write_store(scan_repo(str(git_repo), new_cfg), store) == 0
+    redone = query_store(store, new_cfg)
+    assert len(redone["commits"]) == 3
+    assert redone["per_author_skill"]["Alicia <alice@x>"].keys() == {"Backend"}
+    assert "Alice <alice@x>" not in redone["per_author_skill"]
+
+    window = query_store(store, cfg, since="2024-02-01", until="2024-03-10")
+    assert [c["author"] for c in window["commits"]] == ["Bob <bob@x>"]
+    assert set(window["trend_monthly"]) == {"2024-02"}
+
+    everything = query_store(store, cfg)
+    assert len(everything["commits"]) == 3
+    assert list(everything["trend_monthly"]) == ["2024-01", "2024-02", "2024-03"]